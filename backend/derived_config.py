@@ -0,0 +1,44 @@
+# backend/derived_config.py
+
+# 定义由 FRED 原始序列派生出的模型输入序列
+# 每个派生序列包含：
+#   transform: 变换名称（见 backend/derived_series.py 中的 TRANSFORMS）
+#   sources:   依赖的序列，可以是 FRED 原始序列 ID，也可以是其他派生序列
+#   params:    变换参数（可选）
+# 所有序列统一为月度频率（月初）
+DERIVED_SERIES = {
+    "INFLATION": {
+        "name": "核心通胀率 (环比, 对数差分)",
+        "transform": "log_diff",
+        "sources": ["CPILFESL"],
+        "params": {"scale": 100}
+    },
+    "CPI_YOY": {
+        "name": "CPI 同比 (%)",
+        "transform": "yoy",
+        "sources": ["CPIAUCSL"],
+        "params": {"periods": 12}
+    },
+    "CORE_CPI_YOY": {
+        "name": "核心 CPI 同比 (%)",
+        "transform": "yoy",
+        "sources": ["CPILFESL"],
+        "params": {"periods": 12}
+    },
+    "UNRATE_MA3": {
+        "name": "失业率 3个月移动平均 (%)",
+        "transform": "moving_average",
+        "sources": ["UNRATE"],
+        "params": {"window": 3}
+    },
+    "TERM_SPREAD": {
+        "name": "期限利差: 10年期国债 - 联邦基金利率 (百分点)",
+        "transform": "spread",
+        "sources": ["DGS10", "FEDFUNDS"]
+    },
+    "REAL_FEDFUNDS": {
+        "name": "实际联邦基金利率 (百分点)",
+        "transform": "real_rate",
+        "sources": ["FEDFUNDS", "CORE_CPI_YOY"]
+    }
+}
@@ -0,0 +1,140 @@
+# backend/derived_series.py
+
+"""
+声明式的派生序列层。
+
+派生序列在 backend/derived_config.py 中按名称定义（变换 + 依赖序列），
+计算完全向量化，结果按"指纹"缓存：指纹由定义本身和所有依赖序列的数据内容决定，
+只有依赖的源序列发生变化（或定义被修改）时才会重新计算。
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from backend.derived_config import DERIVED_SERIES
+
+RESAMPLE_FREQ = 'MS'
+
+
+# --- 变换函数（均为向量化的 pandas 运算）---
+def log_diff(series, periods=1, scale=100):
+    return np.log(series).diff(periods) * scale
+
+
+def yoy(series, periods=12):
+    return (series / series.shift(periods) - 1) * 100
+
+
+def moving_average(series, window=3):
+    return series.rolling(window).mean()
+
+
+def spread(left, right):
+    return left - right
+
+
+def real_rate(nominal, inflation):
+    return nominal - inflation
+
+
+TRANSFORMS = {
+    "log_diff": log_diff,
+    "yoy": yoy,
+    "moving_average": moving_average,
+    "spread": spread,
+    "real_rate": real_rate,
+}
+
+
+def series_fingerprint(series):
+    """根据序列内容（含索引）计算指纹，内容不变则指纹不变。"""
+    return hashlib.sha1(pd.util.hash_pandas_object(series, index=True).values.tobytes()).hexdigest()
+
+
+class DerivedSeriesStore:
+    """
+    按名称获取原始序列或派生序列。
+
+    参数:
+    loader: 可调用对象，接收 FRED 序列 ID 列表，返回以日期为索引的原始数据 DataFrame
+    definitions (dict): 派生序列定义，默认为 DERIVED_SERIES
+    """
+
+    def __init__(self, loader, definitions=None, freq=RESAMPLE_FREQ):
+        self.loader = loader
+        self.definitions = DERIVED_SERIES if definitions is None else definitions
+        self.freq = freq
+        self.cache = {}  # {名称: (指纹, pd.Series)}
+
+    def is_derived(self, name):
+        return name in self.definitions
+
+    def raw_dependencies(self, name, path=()):
+        """递归解析某个序列最终依赖的 FRED 原始序列 ID。"""
+        if name in path:
+            raise ValueError(f"派生序列存在循环依赖: {' -> '.join(path + (name,))}")
+        if not self.is_derived(name):
+            return {name}
+
+        spec = self.definitions[name]
+        if spec["transform"] not in TRANSFORMS:
+            raise ValueError(f"派生序列 '{name}' 使用了未知的变换 '{spec['transform']}'。")
+        raw_ids = set()
+        for source in spec["sources"]:
+            raw_ids |= self.raw_dependencies(source, path + (name,))
+        return raw_ids
+
+    def catalog(self):
+        """所有派生序列的说明，供前端展示。"""
+        return [
+            {
+                "series_id": name,
+                "name": spec.get("name", name),
+                "transform": spec["transform"],
+                "sources": spec["sources"],
+                "raw_sources": sorted(self.raw_dependencies(name)),
+            }
+            for name, spec in self.definitions.items()
+        ]
+
+    def get(self, names):
+        """
+        获取一组序列（原始或派生），返回月度频率的 DataFrame，列顺序与 names 一致。
+        """
+        names = list(names)
+        raw_ids = sorted(set().union(*(self.raw_dependencies(n) for n in names)))
+        raw_df = self.loader(raw_ids)
+        # 每个原始序列单独降频：不同序列的发布日期不同，合并后再前向填充会把
+        # 某个序列的旧值延续到其他序列更新的日期上，派生值也就随同时请求的序列而变
+        monthly = {sid: raw_df[sid].dropna().resample(self.freq).first() for sid in raw_ids}
+
+        resolved = {}
+        return pd.DataFrame({name: self._resolve(name, monthly, resolved)[1] for name in names})
+
+    def _resolve(self, name, monthly, resolved):
+        """返回 (指纹, 序列)。resolved 用于在一次请求内复用已解析的依赖。"""
+        if name in resolved:
+            return resolved[name]
+
+        if not self.is_derived(name):
+            series = monthly[name]
+            result = (series_fingerprint(series), series)
+        else:
+            spec = self.definitions[name]
+            deps = [self._resolve(source, monthly, resolved) for source in spec["sources"]]
+            key = repr((name, spec["transform"], spec["sources"], sorted(spec.get("params", {}).items())))
+            fingerprint = hashlib.sha1((key + "|".join(fp for fp, _ in deps)).encode()).hexdigest()
+
+            cached = self.cache.get(name)
+            if cached is not None and cached[0] == fingerprint:
+                series = cached[1]
+            else:
+                transform = TRANSFORMS[spec["transform"]]
+                series = transform(*(s for _, s in deps), **spec.get("params", {})).rename(name)
+                self.cache[name] = (fingerprint, series)
+            result = (fingerprint, series)
+
+        resolved[name] = result
+        return result
@@ -0,0 +1,129 @@
+# backend/event_study.py
+
+"""
+FOMC 事件研究：把每次会议日期对齐到市场序列上，计算会前/会后窗口内的变化，
+并与声明的情感得分做相关分析。所有事件和所有序列一次性向量化计算。
+"""
+
+import numpy as np
+import pandas as pd
+
+# --配置--
+EVENT_SERIES_IDS = ["DGS2", "DGS10", "T10Y2Y", "DFF"]
+# 用来确定交易日的国债市场序列：只有它们有观测值的工作日才算一个交易日
+TRADING_CALENDAR_SERIES = ["DGS2", "DGS10", "T10Y2Y"]
+DEFAULT_PRE_WINDOW = 5   # 会前窗口（交易日）
+DEFAULT_POST_WINDOW = 1  # 会后窗口（交易日），1 即会议当日的变化
+
+
+def trading_day_frame(raw_df, calendar_series=TRADING_CALENDAR_SERIES):
+    """
+    把 FRED 原始数据整理到交易日索引上，再在该索引内前向填充。
+
+    FRED 各序列的日历不同（如 DFF 每天都有值），外连接后的索引包含周末和假日，
+    按行数计算的窗口就不再是交易日。这里先去掉周末，以及所有国债序列都缺失的日期（市场休市），
+    之后窗口长度才对应真实的交易日数。
+    """
+    df = raw_df.sort_index()
+    df = df[df.index.dayofweek < 5]
+    calendar_cols = [c for c in calendar_series if c in df.columns]
+    if calendar_cols:
+        df = df[df[calendar_cols].notna().any(axis=1)]
+    return df.ffill()
+
+
+def align_events(index, event_dates):
+    """
+    将事件日期对齐到序列的时间索引上。
+
+    返回:
+    np.ndarray: 每个事件的基准位置，即会议日之前最后一个观测值的位置
+                （-1 表示事件落在样本区间之外）
+    """
+    positions = np.asarray(pd.DatetimeIndex(index).searchsorted(pd.DatetimeIndex(event_dates), side='left'))
+    return np.where(positions < len(index), positions - 1, -1)
+
+
+def take_rows(values, positions):
+    """按位置取行，越界的位置返回 NaN。"""
+    out = np.full((len(positions), values.shape[1]), np.nan)
+    valid = (positions >= 0) & (positions < len(values))
+    out[valid] = values[positions[valid]]
+    return out
+
+
+def windowed_changes(values, base_positions, pre_window, post_window):
+    """
+    计算每个事件、每个序列的会前变化和会后变化。
+
+    会前变化 = x[base] - x[base - pre_window]
+    会后变化 = x[base + post_window] - x[base]
+
+    返回:
+    (np.ndarray, np.ndarray): 形状均为 (事件数, 序列数)
+    """
+    base_values = take_rows(values, base_positions)
+    pre_change = base_values - take_rows(values, base_positions - pre_window)
+    post_change = take_rows(values, base_positions + post_window) - base_values
+    return pre_change, post_change
+
+
+def correlate_columns(left, right):
+    """
+    计算 left 的每一列与 right 的每一列之间的 Pearson 相关系数（成对剔除缺失值）。
+
+    返回:
+    pd.DataFrame: 行为 left 的列，列为 right 的列
+    """
+    combined = pd.concat([left, right], axis=1).corr()
+    return combined.loc[left.columns, right.columns]
+
+
+def run_event_study(market_df, scores_df, pre_window=DEFAULT_PRE_WINDOW, post_window=DEFAULT_POST_WINDOW):
+    """
+    参数:
+    market_df (pd.DataFrame): 以交易日为索引的市场序列（见 trading_day_frame）
+    scores_df (pd.DataFrame): 含 'date' 列和若干 '*_positive_score' 列的会议得分
+    pre_window (int): 会前窗口长度（交易日）
+    post_window (int): 会后窗口长度（交易日）
+
+    返回:
+    dict: "events"（逐事件变化）、"summary"（各序列变化的描述统计）、
+          "correlation_post" / "correlation_pre"（得分及得分变化与会后/会前变化的相关系数）
+    """
+    if pre_window < 1 or post_window < 1:
+        raise ValueError("窗口长度必须为正整数。")
+
+    market_df = market_df.sort_index()
+    scores_df = scores_df.assign(date=pd.to_datetime(scores_df['date'])).sort_values('date').reset_index(drop=True)
+    score_cols = [c for c in scores_df.columns if c.endswith('_positive_score')]
+
+    base = align_events(market_df.index, scores_df['date'])
+    pre_change, post_change = windowed_changes(market_df.to_numpy(dtype=np.float64), base, pre_window, post_window)
+
+    series = list(market_df.columns)
+    pre_df = pd.DataFrame(pre_change, columns=[f"{s}_pre" for s in series])
+    post_df = pd.DataFrame(post_change, columns=[f"{s}_post" for s in series])
+
+    events = pd.concat([scores_df[['date'] + score_cols], pre_df, post_df], axis=1)
+    events['base_date'] = pd.NaT
+    in_sample = base >= 0
+    events.loc[in_sample, 'base_date'] = market_df.index[base[in_sample]]
+
+    # 得分相对上一次会议的变化，衡量措辞的"意外"程度
+    score_changes = scores_df[score_cols].diff().add_suffix('_change')
+    explanatory = pd.concat([scores_df[score_cols], score_changes], axis=1)
+
+    summary = pd.DataFrame({
+        "mean_pre": pre_df.mean().to_numpy(),
+        "mean_post": post_df.mean().to_numpy(),
+        "std_post": post_df.std().to_numpy(),
+        "n_events": post_df.notna().sum().to_numpy(),
+    }, index=series)
+
+    return {
+        "events": events,
+        "summary": summary,
+        "correlation_post": correlate_columns(explanatory, post_df.set_axis(series, axis=1)),
+        "correlation_pre": correlate_columns(explanatory, pre_df.set_axis(series, axis=1)),
+    }
@@ -0,0 +1,268 @@
+# backend/fomc_crawler.py
+
+"""
+FOMC 声明爬虫：替代 FedTools 的串行抓取。
+
+- 有限并发（线程池）+ 按主机的礼貌限速 + 失败重试；
+- 每抓到一篇声明就追加写入清单文件 (JSON Lines)，中断后重新运行会从断点继续；
+- 已抓取过的 URL / 会议日期不会重复请求，新会议增量追加；
+- base_url 可配置，方便对着本地模拟 federalreserve.gov 的 HTTP 服务器测试。
+"""
+
+import datetime
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin, urlparse
+
+import pandas as pd
+import requests
+from bs4 import BeautifulSoup
+
+# --配置--
+FED_BASE_URL = "https://www.federalreserve.gov"
+CALENDAR_PATH = "/monetarypolicy/fomccalendars.htm"
+HISTORICAL_PATH = "/monetarypolicy/fomchistorical{year}.htm"
+HISTORICAL_LAG_YEARS = 5  # 美联储约在 5 年后才把会议归档到历史页面
+
+MAX_WORKERS = 4
+MIN_REQUEST_INTERVAL = 0.5  # 同一主机两次请求之间的最小间隔（秒）
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 1.0
+REQUEST_TIMEOUT = 30
+USER_AGENT = "economic-policy-analyzer/1.0 (FOMC statement research)"
+
+# 声明链接：2006 年后为 /newsevents/pressreleases/monetaryYYYYMMDDa.htm，
+# 之前为 /boarddocs/press/monetary/YYYY/YYYYMMDD/default.htm，
+# 2000-2001 年的声明位于 /boarddocs/press/general/YYYY/YYYYMMDD/
+STATEMENT_LINK_PATTERN = re.compile(r"/newsevents/pressreleases/monetary(\d{8})a\.htm$")
+BOARDDOCS_LINK_PATTERN = re.compile(r"/boarddocs/press/(?:general|monetary)/\d{4}/(\d{8})/(?:default\.htm)?$")
+# boarddocs 下还有理事会的其他新闻稿，只保留列表页上标注为声明的链接
+STATEMENT_ANCHOR_PATTERN = re.compile(r"statement", re.IGNORECASE)
+
+
+class HostRateLimiter:
+    """保证对同一主机的相邻请求间隔不少于 min_interval 秒（线程安全）。"""
+
+    def __init__(self, min_interval=MIN_REQUEST_INTERVAL):
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.next_allowed = {}
+
+    def wait(self, url):
+        host = urlparse(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_allowed.get(host, now))
+            self.next_allowed[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class CrawlManifest:
+    """
+    已抓取 URL 的持久化清单。每行一个 JSON 记录，写入后立即 flush，
+    因此进程在任意时刻被中断，已完成的部分都不会丢失。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.records = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # 中断时可能留下半行，忽略即可，该 URL 会被重新抓取
+                        continue
+                    self.records[record["url"]] = record
+
+    def __contains__(self, url):
+        return url in self.records
+
+    def add(self, record):
+        with self.lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+            self.records[record["url"]] = record
+
+    def statements(self):
+        """清单中所有声明记录，按日期排序。"""
+        rows = [r for r in self.records.values() if r.get("kind") == "statement"]
+        return sorted(rows, key=lambda r: r["date"])
+
+
+class FomcStatementCrawler:
+    """
+    参数:
+    manifest_path (str): 清单文件路径
+    base_url (str): 站点根地址，测试时可指向本地服务器
+    start_year (int): 只抓取该年份及之后的声明
+    """
+
+    def __init__(self, manifest_path, base_url=FED_BASE_URL, start_year=2000,
+                 max_workers=MAX_WORKERS, min_interval=MIN_REQUEST_INTERVAL,
+                 max_retries=MAX_RETRIES, backoff=BACKOFF_SECONDS):
+        self.base_url = base_url.rstrip("/")
+        self.start_year = start_year
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.manifest = CrawlManifest(manifest_path)
+        self.rate_limiter = HostRateLimiter(min_interval)
+        self.local = threading.local()
+
+    # --- HTTP ---
+    def session(self):
+        # requests.Session 不保证线程安全，每个线程各用一个
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+            self.local.session.headers["User-Agent"] = USER_AGENT
+        return self.local.session
+
+    def fetch(self, url):
+        """
+        带限速和重试地获取页面内容。
+        网络错误、429 和 5xx 会按指数退避重试（优先遵循 Retry-After），404 返回 None。
+        """
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait(url)
+            delay = self.backoff * 2 ** attempt
+            try:
+                response = self.session().get(url, timeout=REQUEST_TIMEOUT)
+            except requests.RequestException as e:
+                error = e
+            else:
+                if response.status_code == 404:
+                    return None
+                if response.status_code != 429 and response.status_code < 500:
+                    response.raise_for_status()
+                    return response.content
+                error = requests.HTTPError(f"HTTP {response.status_code} for {url}", response=response)
+                retry_after = response.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = float(retry_after)
+
+            if attempt == self.max_retries:
+                raise error
+            print(f"  - 请求 {url} 失败 ({error})，{delay:.1f}s 后重试...")
+            time.sleep(delay)
+
+    # --- 链接发现 ---
+    def listing_urls(self):
+        """需要扫描的列表页：当前日历页 + 自 start_year 起已归档的历史年份页。"""
+        urls = [self.base_url + CALENDAR_PATH]
+        last_archived_year = datetime.date.today().year - HISTORICAL_LAG_YEARS
+        for year in range(self.start_year, last_archived_year + 1):
+            urls.append(self.base_url + HISTORICAL_PATH.format(year=year))
+        return urls
+
+    def parse_statement_links(self, page_url, content):
+        """从列表页中解析出 {会议日期: 声明 URL}。"""
+        soup = BeautifulSoup(content, 'html.parser')
+        links = {}
+        for a in soup.find_all('a', href=True):
+            url = urljoin(page_url, a['href'])
+            path = urlparse(url).path
+            match = STATEMENT_LINK_PATTERN.search(path)
+            if match is None:
+                match = BOARDDOCS_LINK_PATTERN.search(path)
+                if match is None or not STATEMENT_ANCHOR_PATTERN.search(a.get_text()):
+                    continue
+            date = datetime.datetime.strptime(match.group(1), "%Y%m%d").date()
+            if date.year >= self.start_year:
+                links.setdefault(date.isoformat(), url)
+        return links
+
+    def discover(self):
+        """
+        扫描列表页，返回 {会议日期: 声明 URL}。
+        历史页面归档后不再变化，其解析出的链接记录在清单中，之后不再重复请求。
+        """
+        calendar_url = self.base_url + CALENDAR_PATH
+        links = {}
+        for url in self.listing_urls():
+            if url in self.manifest:
+                links.update(self.manifest.records[url]["links"])
+                continue
+            content = self.fetch(url)
+            if content is None:
+                continue
+            page_links = self.parse_statement_links(url, content)
+            links.update(page_links)
+            if url != calendar_url:
+                self.manifest.add({"url": url, "kind": "listing", "links": page_links, "fetched_at": now_iso()})
+        return links
+
+    # --- 声明抓取 ---
+    @staticmethod
+    def extract_text(content):
+        soup = BeautifulSoup(content, 'html.parser')
+        for tag in soup(["script", "style", "nav", "header", "footer"]):
+            tag.decompose()
+        article = soup.find('div', id='article') or soup.find('div', id='content') or soup.body or soup
+        return re.sub(r"\s+", " ", article.get_text(" ")).strip()
+
+    def fetch_statement(self, date, url):
+        content = self.fetch(url)
+        if content is None:
+            print(f"  - 警告：{url} 不存在 (404)，已跳过。")
+            return None
+        record = {
+            "url": url,
+            "kind": "statement",
+            "date": date,
+            "statement_text": self.extract_text(content),
+            "fetched_at": now_iso(),
+        }
+        self.manifest.add(record)
+        return record
+
+    def crawl(self, known_dates=()):
+        """
+        增量抓取所有尚未获取的声明。
+
+        参数:
+        known_dates: 已有数据中的会议日期 ('YYYY-MM-DD')，这些会议不会重复抓取
+
+        返回:
+        list[dict]: 本次新抓取的声明记录
+        """
+        known_dates = set(known_dates) | {r["date"] for r in self.manifest.statements()}
+        links = self.discover()
+        pending = {d: u for d, u in links.items() if d not in known_dates and u not in self.manifest}
+        print(f"  - 发现 {len(links)} 篇声明，其中 {len(pending)} 篇需要抓取。")
+
+        new_records = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.fetch_statement, d, u): d for d, u in sorted(pending.items())}
+            for future in as_completed(futures):
+                try:
+                    record = future.result()
+                except requests.RequestException as e:
+                    # 单篇失败不影响其他声明，下次运行时会自动重试
+                    print(f"  - 抓取 {futures[future]} 的声明失败: {e}")
+                    continue
+                if record is not None:
+                    new_records.append(record)
+                    print(f"  - 已抓取 {record['date']} 的声明 ({len(new_records)}/{len(pending)})")
+        return new_records
+
+    def statements_frame(self):
+        """清单中的全部声明，列名与原有原始数据一致 (date, statement_text)。"""
+        rows = self.manifest.statements()
+        return pd.DataFrame(rows, columns=["date", "statement_text", "url"])
+
+
+def now_iso():
+    return datetime.datetime.now().isoformat(timespec="seconds")
@@ -0,0 +1,180 @@
+# backend/granger.py
+
+"""
+成对 Granger 因果检验与滞后阶数选择矩阵。
+
+对每个被解释变量 y，受限模型 (常数项 + y 的滞后) 的 QR 分解只做一次，
+所有候选原因变量 x 的滞后项在其正交补上批量残差化（Frisch–Waugh），
+因此一次即可得到所有 x -> y、所有滞后阶数的 F 检验。
+这部分计算很轻，默认串行；只有序列很多或样本很长时，才把不同的 y 分配到常驻进程池。
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# --配置--
+DEFAULT_MAXLAG = 6
+SUPPORTED_TRANSFORMS = ["diff", "pct", "level"]
+SUPPORTED_CRITERIA = ["aic", "bic"]
+PARALLEL_MIN_SERIES = 16          # 序列数达到该值时使用进程池
+PARALLEL_MIN_WORK = 2_000_000     # 或 样本量 × maxlag × 序列数 达到该值时使用进程池
+
+# 常驻进程池，首次需要时创建，避免每次请求都重新启动子进程
+_process_pool = None
+
+
+def lag_tensor(values, maxlag):
+    """
+    构造滞后张量。
+
+    参数:
+    values (np.ndarray): 形状 (T, k)
+    maxlag (int): 最大滞后阶数
+
+    返回:
+    np.ndarray: 形状 (T - maxlag, k, maxlag)，[:, i, l - 1] 为第 i 个序列的第 l 阶滞后
+    """
+    total = len(values)
+    return np.stack([values[maxlag - lag: total - lag] for lag in range(1, maxlag + 1)], axis=-1)
+
+
+def transform_frame(df, transform="diff"):
+    """Granger 检验要求平稳序列，默认对水平值做一阶差分。"""
+    if transform == "diff":
+        return df.diff().dropna()
+    if transform == "pct":
+        return (df.pct_change() * 100).replace([np.inf, -np.inf], np.nan).dropna()
+    if transform == "level":
+        return df.dropna()
+    raise ValueError(f"不支持的变换 '{transform}'，可选: {SUPPORTED_TRANSFORMS}")
+
+
+def granger_for_target(values, target, maxlag):
+    """
+    计算所有 x -> values[:, target] 在滞后 1..maxlag 下的 Granger F 检验。
+    所有滞后阶数使用同一段样本（去掉前 maxlag 期），以便比较信息准则。
+
+    返回:
+    dict: "f_stat", "p_value", "aic", "bic"，均为形状 (k, maxlag) 的数组
+    """
+    lags = lag_tensor(values, maxlag)
+    y = values[maxlag:, target]
+    n, k = len(y), values.shape[1]
+
+    f_stat = np.full((k, maxlag), np.nan)
+    p_value = np.full((k, maxlag), np.nan)
+    aic = np.full((k, maxlag), np.nan)
+    bic = np.full((k, maxlag), np.nan)
+
+    for p in range(1, maxlag + 1):
+        df_resid = n - 1 - 2 * p
+        if df_resid <= 0:
+            break
+
+        # 受限模型：常数项 + y 自身的 p 阶滞后，对所有 x 共用
+        restricted = np.column_stack([np.ones(n), lags[:, target, :p]])
+        q_r, _ = np.linalg.qr(restricted)
+        y_resid = y - q_r @ (q_r.T @ y)
+        ssr_r = y_resid @ y_resid
+
+        # 所有 x 的滞后项批量投影到受限模型的正交补上: (k, n, p)
+        x_lags = np.moveaxis(lags[:, :, :p], 1, 0)
+        x_resid = x_lags - q_r @ (q_r.T @ x_lags)
+        q_x, _ = np.linalg.qr(x_resid)
+        explained = np.einsum('knp,n->kp', q_x, y_resid)
+        ssr_u = np.maximum(ssr_r - (explained ** 2).sum(axis=1), 1e-300)
+
+        f = ((ssr_r - ssr_u) / p) / (ssr_u / df_resid)
+        f_stat[:, p - 1] = f
+        p_value[:, p - 1] = stats.f.sf(f, p, df_resid)
+        n_params = 1 + 2 * p
+        aic[:, p - 1] = n * np.log(ssr_u / n) + 2 * n_params
+        bic[:, p - 1] = n * np.log(ssr_u / n) + np.log(n) * n_params
+
+    # 自身对自身的检验没有意义
+    for arr in (f_stat, p_value, aic, bic):
+        arr[target] = np.nan
+    return {"f_stat": f_stat, "p_value": p_value, "aic": aic, "bic": bic}
+
+
+def get_process_pool():
+    global _process_pool
+    if _process_pool is None:
+        # API 进程里有其他线程在运行，fork 可能死锁；spawn 的子进程只需导入本模块
+        _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1,
+                                            mp_context=multiprocessing.get_context("spawn"))
+    return _process_pool
+
+
+def use_process_pool(n_obs, k, maxlag):
+    """批量 QR 的开销很小，只有问题规模足够大时，多进程才划算。"""
+    return k >= PARALLEL_MIN_SERIES or n_obs * maxlag * k >= PARALLEL_MIN_WORK
+
+
+def _granger_worker(args):
+    values, target, maxlag = args
+    return target, granger_for_target(values, target, maxlag)
+
+
+def granger_matrix(df, maxlag=DEFAULT_MAXLAG, criterion="aic", n_jobs=None):
+    """
+    计算 df 中所有序列两两之间的 Granger 因果矩阵。
+
+    参数:
+    df (pd.DataFrame): 已变换为平稳的序列，每列一个变量
+    maxlag (int): 最大滞后阶数
+    criterion (str): 选择滞后阶数的信息准则 ("aic" 或 "bic")
+    n_jobs (int): None 表示按问题规模自动选择；1 表示串行；大于 1 表示使用常驻进程池
+
+    返回:
+    dict: 矩阵均以 [原因, 结果] 索引，包括所选滞后阶数下的 p 值、F 统计量，
+          以及每个滞后阶数下的 p 值
+    """
+    if criterion not in SUPPORTED_CRITERIA:
+        raise ValueError(f"不支持的信息准则 '{criterion}'，可选: {SUPPORTED_CRITERIA}")
+
+    values = df.to_numpy(dtype=np.float64)
+    names = list(df.columns)
+    k = len(names)
+    if len(values) <= 2 * maxlag + 1:
+        raise ValueError(f"样本量 ({len(values)}) 不足以检验 {maxlag} 阶滞后。")
+
+    tasks = [(values, target, maxlag) for target in range(k)]
+    parallel = use_process_pool(len(values), k, maxlag) if n_jobs is None else n_jobs > 1
+    if parallel and k > 1:
+        results = dict(get_process_pool().map(_granger_worker, tasks))
+    else:
+        results = dict(map(_granger_worker, tasks))
+
+    # 结果按 [原因 x, 结果 y, 滞后] 排列
+    p_all = np.stack([results[t]["p_value"] for t in range(k)], axis=1)
+    f_all = np.stack([results[t]["f_stat"] for t in range(k)], axis=1)
+    ic_all = np.stack([results[t][criterion] for t in range(k)], axis=1)
+
+    valid = ~np.isnan(ic_all).all(axis=2)
+    best_idx = np.where(valid, np.nanargmin(np.where(np.isnan(ic_all), np.inf, ic_all), axis=2), 0)
+    best_p = np.take_along_axis(p_all, best_idx[..., None], axis=2)[..., 0]
+    best_f = np.take_along_axis(f_all, best_idx[..., None], axis=2)[..., 0]
+
+    return {
+        "series": names,
+        "maxlag": maxlag,
+        "criterion": criterion,
+        "nobs": len(values) - maxlag,
+        "best_lag": np.where(valid, best_idx + 1, 0),
+        "p_value": np.where(valid, best_p, np.nan),
+        "f_stat": np.where(valid, best_f, np.nan),
+        "p_value_by_lag": p_all,
+    }
+
+
+def to_json_matrix(matrix):
+    """把 NumPy 数组转换为可 JSON 序列化的嵌套列表，NaN 转为 None。"""
+    if np.ndim(matrix) > 1:
+        return [to_json_matrix(row) for row in matrix]
+    return [None if np.isnan(v) else float(v) for v in np.asarray(matrix, dtype=np.float64)]
@@ -0,0 +1,97 @@
+# backend/local_projection.py
+
+"""
+Jordà 局部投影 (Local Projection) 脉冲响应。
+
+对每个冲击变量 j、响应变量 i 和期数 h，估计
+    y_i,t+h = a + b_h * y_j,t + (排在 j 之前的变量的当期值) + (所有变量的 1..p 阶滞后) + e
+b_h 即 h 期后的响应：递归识别，冲击变量 y_j 当期变动 1 个单位。
+对应的 VAR 响应是按同一变量顺序做 Cholesky 正交化后、再除以冲击变量自身的当期响应，
+即 orth_irfs[:, i, j] / chol(sigma_u)[j, j]；未正交化的 irfs 对应的是另一种冲击，不能直接比较。
+
+实现上只做一次 QR 分解：设计矩阵按 [常数, 滞后项, y_1,t, ..., y_k,t] 排列，
+冲击变量 j 的回归恰好用到其前若干列，因此所有冲击、所有响应、所有期数
+都由同一个 Q/R 得到；HAC (Newey-West) 标准误同样向量化计算。
+所有期数使用同一段样本（去掉最后 max_horizon 期）。
+"""
+
+import numpy as np
+
+# --配置--
+DEFAULT_LP_LAGS = 2
+CONFIDENCE_Z = 1.96  # 95% 置信区间
+
+
+def newey_west_variance(scores, bandwidths):
+    """
+    向量化的 Newey-West 长期方差。
+
+    参数:
+    scores (np.ndarray): 形状 (n, m)，每列为一个系数的影响函数值 z_t
+    bandwidths (np.ndarray): 形状 (m,)，每列的截断滞后阶数
+
+    返回:
+    np.ndarray: 形状 (m,) 的方差估计
+    """
+    n = len(scores)
+    variance = (scores ** 2).sum(axis=0)
+    for lag in range(1, min(int(bandwidths.max()), n - 1) + 1):
+        weights = np.clip(1 - lag / (bandwidths + 1), 0, None)
+        autocov = (scores[lag:] * scores[:-lag]).sum(axis=0)
+        variance += 2 * weights * autocov
+    return np.maximum(variance, 0)
+
+
+def local_projection_irf(data, max_horizon=12, lags=DEFAULT_LP_LAGS):
+    """
+    一次性估计所有 (冲击, 响应, 期数) 组合的局部投影脉冲响应。
+
+    参数:
+    data (pd.DataFrame): 每列一个变量，列顺序即递归识别的排序
+    max_horizon (int): 最大期数 H
+    lags (int): 控制变量的滞后阶数 p
+
+    返回:
+    dict: "names"、"irfs"、"stderr"，后两者形状为 (H + 1, 响应, 冲击)，
+          与 statsmodels 的 irf.irfs 的索引方式相同
+    """
+    values = data.to_numpy(dtype=np.float64)
+    names = list(data.columns)
+    total, k = values.shape
+    n = total - lags - max_horizon
+    if n <= 1 + k * (lags + 1):
+        raise ValueError(f"样本量 ({total}) 不足以估计 {max_horizon} 期、{lags} 阶滞后的局部投影。")
+
+    # t 取 lags .. lags + n - 1
+    rows = np.arange(lags, lags + n)
+    lag_block = np.hstack([values[rows - lag] for lag in range(1, lags + 1)])
+    design = np.column_stack([np.ones(n), lag_block, values[rows]])
+    n_controls = 1 + k * lags
+
+    # 目标矩阵：所有期数、所有响应变量，列按 (h, i) 排列
+    targets = np.hstack([values[rows + h] for h in range(max_horizon + 1)])
+    horizons = np.repeat(np.arange(max_horizon + 1), k)
+
+    q, r = np.linalg.qr(design)
+    qty = q.T @ targets
+
+    irfs = np.zeros((max_horizon + 1, k, k))
+    stderr = np.zeros((max_horizon + 1, k, k))
+    for j in range(k):
+        m = n_controls + j + 1  # 冲击 j 的回归只用到前 m 列
+        # 系数 b = e_m' R_m^{-1} Q_m' Y = w' Q_m' Y，其中 R_m' w = e_m
+        e_last = np.zeros(m)
+        e_last[-1] = 1.0
+        w = np.linalg.solve(r[:m, :m].T, e_last)
+        coefs = w @ qty[:m]
+
+        residuals = targets - q[:, :m] @ qty[:m]
+        influence = q[:, :m] @ w                # 形状 (n,)
+        scores = influence[:, None] * residuals  # 形状 (n, (H+1)*k)
+        # h 期的局部投影误差为 MA(h) 过程，截断阶数取 h + 1
+        se = np.sqrt(newey_west_variance(scores, horizons + 1))
+
+        irfs[:, :, j] = coefs.reshape(max_horizon + 1, k)
+        stderr[:, :, j] = se.reshape(max_horizon + 1, k)
+
+    return {"names": names, "irfs": irfs, "stderr": stderr, "nobs": n, "lags": lags}
@@ -1,7 +1,11 @@
 # backend/main_api.py
 
 import datetime
+import hashlib
+import importlib
+import json
 import os
+import time
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -13,18 +17,72 @@ from transformers import pipeline
 import requests
 from bs4 import BeautifulSoup
 import uvicorn
-from backend.nlp_config import POLICY_DIMENSIONS # 导入我们的新配置
+from backend import nlp_config # 导入我们的新配置（支持热加载）
+from backend.derived_series import DerivedSeriesStore
+from backend.event_study import run_event_study, trading_day_frame, EVENT_SERIES_IDS, DEFAULT_PRE_WINDOW, DEFAULT_POST_WINDOW
+from backend.granger import granger_matrix, transform_frame, to_json_matrix, DEFAULT_MAXLAG
+from backend.local_projection import local_projection_irf, CONFIDENCE_Z
+from backend.nlp_embeddings import FomcEmbeddingIndex, SentenceEncoder
+from backend.nlp_preprocess import score_sentences
+from backend.nlp_scoring import load_sentence_table, score_dimensions, normalize_date, validate_policy_dimensions
 
 app = FastAPI(title="经济政策影响分析工具 API")
 
 # --全局变量和缓存--
 sentiment_analyzer = pipeline("sentiment-analysis", model="ProsusAI/finbert")
-var_model_result = None
+var_model_results = {}  # {模型名: (模型数据版本号, VAR 拟合结果)}
+lp_irf_results = {}     # {(模型名, 模型数据版本号, 期数, 滞后阶数): 局部投影结果}
 # --- 步骤 1: 创建全局变量来缓存数据 ---
 fomc_analysis_df = None
+fomc_statements_df = None   # 声明原文 (date, statement_text)
+fomc_sentence_table = None  # 句子级情感表，维度得分由它聚合而来
+nlp_config_mtime = None
+fomc_embedding_index = None  # 句子/声明向量索引
+sentence_encoder = None      # 仅在按文本检索时才加载
+fred_data_cache = {}  # {序列ID元组: (获取时间, DataFrame, 数据版本号)}
+granger_cache = {}    # {(数据版本号, 序列, 参数...): 结果}
+event_study_cache = {}  # {(市场数据版本号, 得分版本号, 序列, 窗口): 结果}
 
 # --配置--
-SUPPORTED_SERIES_IDS = ["FEDFUNDS", "CPILFESL"]
+# VAR 模型注册表：变量可以是 FRED 原始序列，也可以是 derived_config.py 中的派生序列
+VAR_MODELS = {
+    "baseline": {"name": "基准模型: 利率 + 通胀", "variables": ["FEDFUNDS", "INFLATION"], "lags": 2},
+    "extended": {"name": "扩展模型: 利率 + 通胀 + 失业率", "variables": ["FEDFUNDS", "INFLATION", "UNRATE"], "lags": 2},
+}
+ALL_SERIES_IDS = ["GDP", "CPIAUCSL", "FEDFUNDS", "UNRATE", "DGS10"]
+FRED_CACHE_TTL_SECONDS = 6 * 60 * 60
+# VAR 与局部投影共用的冲击识别方式
+IRF_IDENTIFICATION = "递归识别 (Cholesky, 按模型变量顺序)，冲击变量当期变动 1 个单位"
+
+
+# --数据获取与缓存--
+def data_version(df):
+    """根据数据内容计算一个简短的版本号，数据不变则版本号不变。"""
+    return hashlib.sha1(pd.util.hash_pandas_object(df, index=True).values.tobytes()).hexdigest()[:12]
+
+
+def fetch_fred_data(series_ids):
+    """
+    从 FRED 获取原始数据，并在内存中缓存 FRED_CACHE_TTL_SECONDS 秒。
+
+    返回:
+    (pd.DataFrame, str): 原始数据及其数据版本号
+    """
+    key = tuple(series_ids)
+    cached = fred_data_cache.get(key)
+    if cached is not None and time.time() - cached[0] < FRED_CACHE_TTL_SECONDS:
+        return cached[1], cached[2]
+
+    start_date = datetime.datetime(2000, 1, 1)
+    end_date = datetime.datetime.now()
+    df_raw = web.DataReader(list(series_ids), 'fred', start_date, end_date)
+    version = data_version(df_raw)
+    fred_data_cache[key] = (time.time(), df_raw, version)
+    return df_raw, version
+
+
+# 派生序列只在其依赖的源序列变化时才重新计算
+derived_store = DerivedSeriesStore(lambda series_ids: fetch_fred_data(series_ids)[0])
 
 
 # --API 端点--
@@ -35,11 +93,9 @@ def read_root():
 
 @app.get("/data/fred/all")
 def get_all_fred_data():
-    all_series_ids = ["GDP", "CPIAUCSL", "FEDFUNDS", "UNRATE", "DGS10"]
+    all_series_ids = ALL_SERIES_IDS
     try:
-        start_date = datetime.datetime(2000, 1, 1)
-        end_date = datetime.datetime.now()
-        df_raw = web.DataReader(all_series_ids, 'fred', start_date, end_date)
+        df_raw, _ = fetch_fred_data(all_series_ids)
         df_filled = df_raw.ffill()
         df_cleaned = df_filled.dropna()
         df_cleaned.columns = [col.lower() for col in df_cleaned.columns]
@@ -52,6 +108,136 @@ def get_all_fred_data():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/data/derived/catalog")
+def get_derived_catalog():
+    """返回所有可用的派生序列及其依赖。"""
+    try:
+        return {"data": derived_store.catalog()}
+    except ValueError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/data/derived")
+def get_derived_series(names: str):
+    """
+    按名称获取月度序列，名称之间用逗号分隔，可混合使用派生序列和 FRED 原始序列 ID。
+    例如 /data/derived?names=INFLATION,REAL_FEDFUNDS,FEDFUNDS
+    """
+    series_ids = [n.strip().upper() for n in names.split(",") if n.strip()]
+    if not series_ids:
+        raise HTTPException(status_code=400, detail="需要至少一个序列名称。")
+
+    try:
+        df = derived_store.get(series_ids).dropna(how='all')
+        df.index.name = 'DATE'
+        return {
+            "data": json.loads(df.reset_index().to_json(orient='records', date_format='iso')),
+            "series_ids": series_ids
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/analysis/granger")
+def get_granger_matrix(request_data: dict):
+    """
+    计算所选序列两两之间的 Granger 因果 p 值矩阵及各自的最优滞后阶数。
+    矩阵按 [原因, 结果] 索引：matrix[i][j] 为 "序列 i 不是序列 j 的 Granger 原因" 的 p 值。
+    """
+    series_ids = [s.upper() for s in request_data.get("series", ALL_SERIES_IDS)]
+    maxlag = int(request_data.get("maxlag", DEFAULT_MAXLAG))
+    transform = request_data.get("transform", "diff")
+    criterion = request_data.get("criterion", "aic")
+    n_jobs = request_data.get("n_jobs")  # None 表示按问题规模自动决定是否使用进程池
+    n_jobs = None if n_jobs is None else int(n_jobs)
+
+    if len(series_ids) < 2:
+        raise HTTPException(status_code=400, detail="至少需要选择两个序列。")
+    if maxlag < 1:
+        raise HTTPException(status_code=400, detail="maxlag 必须为正整数。")
+    if n_jobs is not None and n_jobs < 1:
+        raise HTTPException(status_code=400, detail="n_jobs 必须为正整数。")
+
+    try:
+        df_raw, version = fetch_fred_data(series_ids)
+        cache_key = (version, tuple(series_ids), maxlag, transform, criterion)
+        if cache_key in granger_cache:
+            return granger_cache[cache_key]
+
+        # 统一到月度频率后再做平稳化变换
+        df_monthly = df_raw.ffill().resample('MS').last().dropna()
+        model_data = transform_frame(df_monthly[series_ids], transform)
+        result = granger_matrix(model_data, maxlag=maxlag, criterion=criterion, n_jobs=n_jobs)
+
+        response = {
+            "series": [s.lower() for s in result["series"]],
+            "data_version": version,
+            "maxlag": maxlag,
+            "transform": transform,
+            "criterion": criterion,
+            "nobs": result["nobs"],
+            "p_value": to_json_matrix(result["p_value"]),
+            "f_stat": to_json_matrix(result["f_stat"]),
+            "best_lag": result["best_lag"].tolist(),
+            "p_value_by_lag": to_json_matrix(result["p_value_by_lag"]),
+        }
+        granger_cache[cache_key] = response
+        return response
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"An error occurred during Granger analysis: {e}")
+
+
+@app.post("/analysis/fomc/event_study")
+def get_fomc_event_study(request_data: dict):
+    """
+    FOMC 事件研究：计算每次会议前后窗口内市场序列的变化，并与声明情感得分做相关分析。
+    """
+    series_ids = [s.upper() for s in request_data.get("series", EVENT_SERIES_IDS)]
+    pre_window = int(request_data.get("pre_window", DEFAULT_PRE_WINDOW))
+    post_window = int(request_data.get("post_window", DEFAULT_POST_WINDOW))
+
+    refresh_policy_dimensions()
+    if fomc_analysis_df is None or fomc_analysis_df.empty:
+        raise HTTPException(status_code=404, detail="分析数据尚未加载或文件为空。请检查服务器启动日志。")
+
+    try:
+        df_raw, market_version = fetch_fred_data(series_ids)
+        score_cols = [c for c in fomc_analysis_df.columns if c.endswith('_positive_score')]
+        scores_df = fomc_analysis_df[['date'] + score_cols]
+        cache_key = (market_version, data_version(scores_df), tuple(series_ids), pre_window, post_window)
+        if cache_key in event_study_cache:
+            return event_study_cache[cache_key]
+
+        result = run_event_study(trading_day_frame(df_raw[series_ids]), scores_df, pre_window, post_window)
+
+        response = {
+            "series": series_ids,
+            "pre_window": pre_window,
+            "post_window": post_window,
+            "data_version": market_version,
+            "events": json.loads(result["events"].to_json(orient='records', date_format='iso')),
+            "summary": json.loads(result["summary"].to_json(orient='index')),
+            "correlation_post": json.loads(result["correlation_post"].to_json(orient='index')),
+            "correlation_pre": json.loads(result["correlation_pre"].to_json(orient='index')),
+        }
+        event_study_cache[cache_key] = response
+        return response
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"An error occurred during event study: {e}")
+
+
 @app.post("/analysis/nlp")
 def analyze_fomc_statement(url_item: dict):
     """
@@ -61,6 +247,7 @@ def analyze_fomc_statement(url_item: dict):
     if not url:
         raise HTTPException(status_code=400, detail="URL is required.")
     
+    refresh_policy_dimensions()
     try:
         # 1. 爬取文本 (代码不变)
         response = requests.get(url)
@@ -74,7 +261,7 @@ def analyze_fomc_statement(url_item: dict):
         
         # 2. 进行多维度分析
         analysis_results = []
-        for dim_key, dim_info in POLICY_DIMENSIONS.items():
+        for dim_key, dim_info in nlp_config.POLICY_DIMENSIONS.items():
             
             # 找到与该维度相关的句子
             relevant_sentences = []
@@ -88,7 +275,7 @@ def analyze_fomc_statement(url_item: dict):
             else:
                 # 对所有相关句子进行情感分析
                 # 我们这里使用 FinBERT，它能返回 'positive', 'negative', 'neutral'
-                sentiments = sentiment_analyzer(relevant_sentences)
+                sentiments = score_sentences(sentiment_analyzer, relevant_sentences)
                 
                 # 3. 计算得分
                 positive_score = sum(s['score'] for s in sentiments if s['label'] == 'positive')
@@ -117,65 +304,139 @@ def analyze_fomc_statement(url_item: dict):
         raise HTTPException(status_code=500, detail=f"An error occurred: {e}")
 
 
+@app.get("/simulate/var_models")
+def get_var_models():
+    """返回 VAR 模型注册表，前端据此列出可选模型及其变量。"""
+    return {
+        "data": [
+            {"model": name, "name": spec.get("name", name), "variables": spec["variables"], "lags": spec["lags"]}
+            for name, spec in VAR_MODELS.items()
+        ]
+    }
+
+
 @app.post("/simulate/var_irf")
 def get_var_irf(request_data: dict):
-    global var_model_result
-
     steps = request_data.get("steps", 12)
     impulse = request_data.get("impulse", "FEDFUNDS")
     response_var = request_data.get("response", "INFLATION")
     shock_size = request_data.get("shock_size", 1.0)
+    model_name = request_data.get("model", "baseline")
+    method = request_data.get("method", "var")
 
-    try:
-        if var_model_result is None:
-            print("Training VAR model for the first time...")
-            start_date = datetime.datetime(2000, 1, 1)
-            end_date = datetime.datetime.now()
-
-            df = web.DataReader(SUPPORTED_SERIES_IDS, 'fred', start_date, end_date)
-            df_monthly = df.ffill().resample('MS').first()
-
-            df_monthly['INFLATION'] = np.log(df_monthly['CPILFESL']).diff() * 100
-            df_monthly = df_monthly.dropna()
-
-            model_data = df_monthly[['FEDFUNDS', 'INFLATION']]
-            model = VAR(model_data)
-            var_model_result = model.fit(2)
-            print("VAR model trained and cached.")
-
-        irf = var_model_result.irf(periods=steps)
-
-        impulse_idx = var_model_result.names.index(impulse)
-        response_idx = var_model_result.names.index(response_var)
+    if model_name not in VAR_MODELS:
+        raise HTTPException(status_code=400, detail=f"未知的模型 '{model_name}'，可选: {list(VAR_MODELS)}")
+    if method not in ("var", "lp"):
+        raise HTTPException(status_code=400, detail=f"未知的方法 '{method}'，可选: ['var', 'lp']")
 
-        irf_values = irf.irfs[:, response_idx, impulse_idx]
-
-        scaled_irf_values = irf_values * shock_size
-        irf_data = [{"step": i, "value": val} for i, val in enumerate(scaled_irf_values)]
+    try:
+        model_spec = VAR_MODELS[model_name]
+        model_data = derived_store.get(model_spec["variables"]).dropna()
+        version = data_version(model_data)
+
+        if method == "lp":
+            # 局部投影：一次估计即得到所有冲击、响应和期数的结果，按模型数据版本缓存
+            lags = int(request_data.get("lags", model_spec["lags"]))
+            cache_key = (model_name, version, steps, lags)
+            if cache_key not in lp_irf_results:
+                print(f"Estimating local projections for model '{model_name}'...")
+                lp_irf_results[cache_key] = local_projection_irf(model_data, max_horizon=steps, lags=lags)
+            lp_result = lp_irf_results[cache_key]
+
+            impulse_idx = lp_result["names"].index(impulse)
+            response_idx = lp_result["names"].index(response_var)
+            irf_values = lp_result["irfs"][:, response_idx, impulse_idx] * shock_size
+            band = CONFIDENCE_Z * lp_result["stderr"][:, response_idx, impulse_idx] * abs(shock_size)
+            irf_data = [
+                {"step": i, "value": val, "lower": val - width, "upper": val + width}
+                for i, (val, width) in enumerate(zip(irf_values, band))
+            ]
+        else:
+            cached = var_model_results.get(model_name)
+            if cached is None or cached[0] != version:
+                print(f"Training VAR model '{model_name}'...")
+                model = VAR(model_data)
+                var_model_results[model_name] = (version, model.fit(model_spec["lags"]))
+                print("VAR model trained and cached.")
+            var_model_result = var_model_results[model_name][1]
+
+            irf = var_model_result.irf(periods=steps)
+
+            impulse_idx = var_model_result.names.index(impulse)
+            response_idx = var_model_result.names.index(response_var)
+
+            # 正交化响应除以冲击变量自身的当期响应 (Cholesky 对角元)，
+            # 即冲击在当期为 1 个单位，与局部投影的识别相同
+            chol = np.linalg.cholesky(np.asarray(var_model_result.sigma_u))
+            irf_values = irf.orth_irfs[:, response_idx, impulse_idx] / chol[impulse_idx, impulse_idx]
+
+            scaled_irf_values = irf_values * shock_size
+            irf_data = [{"step": i, "value": val} for i, val in enumerate(scaled_irf_values)]
 
         return {
+            "model": model_name,
+            "method": method,
             "impulse": impulse,
             "response": response_var,
             "steps": steps,
             "shock_size": shock_size,
+            "identification": IRF_IDENTIFICATION,
             "data": irf_data
         }
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"An error occurred during VAR simulation: {e}")
 
 
+# --- 政策维度热加载 ---
+def refresh_policy_dimensions():
+    """
+    检查 nlp_config.py 是否被修改。若有修改则热加载维度定义，
+    并在句子级情感表上重新聚合历史得分（无需重新运行 FinBERT）。
+    """
+    global nlp_config_mtime, fomc_analysis_df
+
+    mtime = os.path.getmtime(nlp_config.__file__)
+    if mtime == nlp_config_mtime:
+        return
+
+    previous_dimensions = nlp_config.POLICY_DIMENSIONS
+    try:
+        if nlp_config_mtime is not None:
+            importlib.reload(nlp_config)
+        validate_policy_dimensions(nlp_config.POLICY_DIMENSIONS)
+        scores_df = None
+        if fomc_sentence_table is not None and fomc_statements_df is not None:
+            scores_df = score_dimensions(fomc_sentence_table, nlp_config.POLICY_DIMENSIONS)
+    except Exception as e:
+        # 配置文件可能正在编辑中，保留旧的定义和得分，下次请求时再试
+        nlp_config.POLICY_DIMENSIONS = previous_dimensions
+        print(f"警告：重新加载 nlp_config.py 失败，继续使用旧的维度定义。错误: {e}")
+        return
+
+    if nlp_config_mtime is not None:
+        print("检测到 nlp_config.py 变更，已重新加载政策维度定义。")
+    nlp_config_mtime = mtime
+    if scores_df is not None:
+        fomc_analysis_df = fomc_statements_df.merge(scores_df, on='date', how='inner')
+        print(f"已基于句子表重新计算 {len(scores_df.columns) - 1} 个维度的历史得分。")
+
+
 # --- 步骤 2: 使用 FastAPI 的启动事件来加载数据 ---
 @app.on_event("startup")
 def load_data_on_startup():
     """
     在 FastAPI 服务器启动时，执行此函数一次，将数据加载到内存中。
     """
-    global fomc_analysis_df
+    global fomc_analysis_df, fomc_statements_df, fomc_sentence_table, fomc_embedding_index
     
     analysis_file_path = os.path.join("data", "fomc_analysis.csv")
+    sentence_table_path = os.path.join("data", "fomc_sentences.csv")
+    embeddings_path = os.path.join("data", "fomc_sentence_embeddings.npy")
     print(f"服务器启动：正在从 '{analysis_file_path}' 加载分析数据...")
     
     if not os.path.exists(analysis_file_path):
@@ -184,17 +445,32 @@ def load_data_on_startup():
         fomc_analysis_df = pd.DataFrame() 
     else:
         fomc_analysis_df = pd.read_csv(analysis_file_path)
+        fomc_statements_df = fomc_analysis_df[['date', 'statement_text']].copy()
+        fomc_statements_df['date'] = fomc_statements_df['date'].map(normalize_date)
         print("分析数据加载成功，已缓存到内存。")
 
+    fomc_sentence_table = load_sentence_table(sentence_table_path)
+    if fomc_sentence_table is None:
+        print(f"提示：句子表 '{sentence_table_path}' 未找到，修改维度定义后需重新运行 scrape_fomc.py。")
+    else:
+        print(f"句子级情感表加载成功，共 {len(fomc_sentence_table)} 个句子。")
+    refresh_policy_dimensions()
+
+    fomc_embedding_index = FomcEmbeddingIndex.load(fomc_sentence_table, embeddings_path)
+    if fomc_embedding_index is not None:
+        print(f"向量索引加载成功，共 {len(fomc_embedding_index.dates)} 条声明。")
+
 
 # --- 步骤 3: 修改 API 接口，让它从缓存中读取数据 ---
 @app.get("/analysis/fomc/history")
 def get_fomc_analysis_history():
     """
     从内存缓存中直接读取并返回所有 FOMC 会议的历史分析数据。
+    若 nlp_config.py 中的维度定义有变化，会先在句子表上重新聚合得分。
     """
     global fomc_analysis_df
     
+    refresh_policy_dimensions()
     if fomc_analysis_df is None or fomc_analysis_df.empty:
         raise HTTPException(
             status_code=404, 
@@ -206,6 +482,70 @@ def get_fomc_analysis_history():
     return {"data": results}
 
 
+def require_embedding_index():
+    if fomc_embedding_index is None:
+        raise HTTPException(
+            status_code=404,
+            detail="向量索引尚未加载。请先运行 scrape_fomc.py 生成句向量，并检查服务器启动日志。"
+        )
+    return fomc_embedding_index
+
+
+def resolve_meeting_date(index, date):
+    if not date:
+        raise HTTPException(status_code=400, detail="需要提供会议日期 'date'。")
+    try:
+        date = normalize_date(date)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail=f"无法解析日期: {date}")
+    if date not in index.dates:
+        raise HTTPException(status_code=404, detail=f"没有 {date} 的会议声明。")
+    return date
+
+
+@app.post("/analysis/fomc/similar")
+def find_similar_statements(request_data: dict):
+    """
+    检索与某次会议声明（"date"）或任意文本（"text"）最相似的历史声明。
+    """
+    global sentence_encoder
+
+    index = require_embedding_index()
+    k = int(request_data.get("k", 5))
+    date = request_data.get("date")
+    text = request_data.get("text")
+
+    if date:
+        date = resolve_meeting_date(index, date)
+        results = index.similar_statements(index.statement_vector(date), k=k, exclude_date=date)
+    elif text:
+        if sentence_encoder is None:
+            sentence_encoder = SentenceEncoder()
+        query = sentence_encoder.encode([s for s in text.lower().split('.') if s.strip()] or [text])
+        query = query.mean(axis=0)
+        query /= max(np.linalg.norm(query), 1e-12)
+        results = index.similar_statements(query, k=k)
+    else:
+        raise HTTPException(status_code=400, detail="需要提供 'date' 或 'text'。")
+
+    return {"query_date": date, "k": k, "data": results}
+
+
+@app.post("/analysis/fomc/changes")
+def get_statement_changes(request_data: dict):
+    """
+    "与上次会议相比有什么变化"：将本次声明的每个句子与上一次声明中最相似的句子对齐。
+    """
+    index = require_embedding_index()
+    date = resolve_meeting_date(index, request_data.get("date"))
+    previous_date = request_data.get("previous_date")
+    if previous_date:
+        previous_date = resolve_meeting_date(index, previous_date)
+    threshold = float(request_data.get("threshold", 0.85))
+
+    return index.align_sentences(date, previous_date=previous_date, threshold=threshold)
+
+
 @app.post("/analysis/nlp/realtime") # 使用新的、更明确的路径
 def analyze_single_fomc_statement(url_item: dict):
     """
@@ -215,6 +555,7 @@ def analyze_single_fomc_statement(url_item: dict):
     if not url:
         raise HTTPException(status_code=400, detail="URL is required.")
     
+    refresh_policy_dimensions()
     try:
         # 1. 爬取文本
         response = requests.get(url)
@@ -228,7 +569,7 @@ def analyze_single_fomc_statement(url_item: dict):
         
         # 2. 进行多维度分析 (逻辑与脚本中的一致)
         analysis_results = []
-        for dim_key, dim_info in POLICY_DIMENSIONS.items():
+        for dim_key, dim_info in nlp_config.POLICY_DIMENSIONS.items():
             relevant_sentences = []
             for sentence in statement_text.split('.'):
                 if any(keyword in sentence for keyword in dim_info["keywords"]):
@@ -237,7 +578,7 @@ def analyze_single_fomc_statement(url_item: dict):
             if not relevant_sentences:
                 score_positive = 50
             else:
-                sentiments = sentiment_analyzer(relevant_sentences)
+                sentiments = score_sentences(sentiment_analyzer, relevant_sentences)
                 positive_score = sum(s['score'] for s in sentiments if s['label'] == 'positive')
                 negative_score = sum(s['score'] for s in sentiments if s['label'] == 'negative')
                 total_score = positive_score + negative_score
@@ -0,0 +1,258 @@
+# backend/nlp_embeddings.py
+
+"""
+FOMC 声明与句子的向量索引。
+
+- 句子向量与句子表 (fomc_sentences.csv) 逐行对齐，保存为 float32 的 .npy 文件，按 memory-map 方式读取。
+- 向量均已 L2 归一化，余弦相似度即为内积。
+- 语料较小时用 NumPy 暴力检索；安装了 faiss 且语料超过阈值时自动切换为近似索引 (HNSW)。
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import torch
+from transformers import AutoModel, AutoTokenizer
+
+from backend.nlp_preprocess import plan_batches
+
+try:
+    import faiss
+except ImportError:  # faiss 是可选依赖
+    faiss = None
+
+# --配置--
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_BATCH_SIZE = 64
+APPROX_INDEX_THRESHOLD = 50000  # 向量数超过该值且安装了 faiss 时使用近似索引
+HNSW_NEIGHBORS = 32
+
+
+class SentenceEncoder:
+    """句向量编码器：Transformer 输出做 mean pooling 后 L2 归一化。"""
+
+    def __init__(self, model_name=EMBEDDING_MODEL):
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModel.from_pretrained(model_name)
+        self.model.eval()
+
+    def encode(self, sentences, batch_size=EMBEDDING_BATCH_SIZE):
+        sentences = list(sentences)
+        dim = self.model.config.hidden_size
+        embeddings = np.zeros((len(sentences), dim), dtype=np.float32)
+        if not sentences:
+            return embeddings
+
+        encoded = self.tokenizer(sentences, truncation=True)["input_ids"]
+        lengths = [len(ids) for ids in encoded]
+        with torch.no_grad():
+            # 与情感分析相同，按长度分桶以减少 padding
+            for batch in plan_batches(lengths, batch_size):
+                inputs = self.tokenizer.pad({"input_ids": [encoded[i] for i in batch]}, return_tensors="pt")
+                hidden = self.model(**inputs).last_hidden_state
+                mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+                pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+                embeddings[batch] = pooled.numpy()
+
+        return normalize_rows(embeddings)
+
+
+def normalize_rows(matrix):
+    """对矩阵逐行做 L2 归一化。"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return (matrix / np.where(norms > 0, norms, 1)).astype(np.float32)
+
+
+def sentence_row_keys(sentence_table):
+    """每一行 (date, sentence_idx, sentence) 的 64 位指纹，用来确认句向量对应的是哪个句子。"""
+    key_columns = sentence_table[['date', 'sentence_idx', 'sentence']].astype(str)
+    return pd.util.hash_pandas_object(key_columns, index=False).to_numpy(dtype=np.uint64)
+
+
+def keys_path_for(path):
+    """与句向量文件逐行对应的指纹文件路径。"""
+    return os.path.splitext(path)[0] + "_keys.npy"
+
+
+def build_sentence_embeddings(sentence_table, path, encoder=None):
+    """
+    为句子表中尚未编码的行计算句向量，并写入 float32 的 .npy 文件。
+
+    每行的 (date, sentence_idx, sentence) 指纹另存一份；只有指纹匹配的旧向量才会被复用，
+    句子表被重建或重新排序时，不会把旧向量错配到其他句子上。
+    """
+    keys = sentence_row_keys(sentence_table)
+    keys_path = keys_path_for(path)
+
+    existing, existing_rows = None, {}
+    if os.path.exists(path) and os.path.exists(keys_path):
+        existing = np.load(path, mmap_mode='r')
+        existing_keys = np.load(keys_path)
+        if len(existing_keys) == len(existing):
+            existing_rows = {key: row for row, key in enumerate(existing_keys.tolist())}
+        else:
+            print(f"  - 警告：'{keys_path}' 与句向量行数不一致，全部重新编码。")
+
+    source_rows = np.array([existing_rows.get(key, -1) for key in keys.tolist()], dtype=np.int64)
+    missing = np.flatnonzero(source_rows < 0)
+    if len(missing) == 0 and existing is not None and len(existing) == len(keys) \
+            and np.array_equal(source_rows, np.arange(len(keys))):
+        print("  - 句向量已是最新，无需重新编码。")
+        return
+
+    encoder = encoder or SentenceEncoder()
+    print(f"  - 正在为 {len(missing)} 个句子计算句向量（复用 {len(keys) - len(missing)} 个）...")
+    new_embeddings = encoder.encode(sentence_table['sentence'].iloc[missing].astype(str))
+    dim = new_embeddings.shape[1] if existing is None or len(missing) else existing.shape[1]
+
+    tmp_path = path + ".tmp"
+    matrix = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=(len(keys), dim))
+    reused = np.flatnonzero(source_rows >= 0)
+    if len(reused):
+        matrix[reused] = existing[source_rows[reused]]
+    if len(missing):
+        matrix[missing] = new_embeddings
+    matrix.flush()
+    del matrix, existing
+    os.replace(tmp_path, path)
+    np.save(keys_path, keys)
+    print(f"  - 句向量已保存到: {path}")
+
+
+class VectorIndex:
+    """
+    单位向量矩阵上的 top-k 余弦相似度检索。
+    """
+
+    def __init__(self, vectors, use_approx=None):
+        self.vectors = vectors
+        if use_approx is None:
+            use_approx = faiss is not None and len(vectors) >= APPROX_INDEX_THRESHOLD
+        self.approx_index = None
+        if use_approx:
+            if faiss is None:
+                raise ImportError("近似索引需要安装 faiss (pip install faiss-cpu)。")
+            self.approx_index = faiss.IndexHNSWFlat(vectors.shape[1], HNSW_NEIGHBORS, faiss.METRIC_INNER_PRODUCT)
+            self.approx_index.add(np.ascontiguousarray(vectors, dtype=np.float32))
+
+    def search(self, queries, k=5):
+        """
+        参数:
+        queries (np.ndarray): 形状为 (m, dim) 的单位向量
+        k (int): 返回的近邻个数
+
+        返回:
+        (scores, indices): 两个形状为 (m, k) 的数组，按相似度降序
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        k = min(k, len(self.vectors))
+        if k == 0:
+            return np.zeros((len(queries), 0), np.float32), np.zeros((len(queries), 0), np.int64)
+
+        if self.approx_index is not None:
+            return self.approx_index.search(np.ascontiguousarray(queries), k)
+
+        scores = queries @ np.asarray(self.vectors).T
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return np.take_along_axis(top_scores, order, axis=1), np.take_along_axis(top, order, axis=1)
+
+
+class FomcEmbeddingIndex:
+    """
+    FOMC 句子与声明两级索引。声明向量由其句向量取均值并归一化得到。
+    """
+
+    def __init__(self, sentence_table, sentence_vectors):
+        self.sentence_table = sentence_table.reset_index(drop=True)
+        self.sentence_vectors = sentence_vectors
+
+        codes, dates = pd.factorize(self.sentence_table['date'], sort=True)
+        self.dates = list(dates)
+        self.sentence_codes = codes
+        statement_vectors = np.zeros((len(dates), sentence_vectors.shape[1]), dtype=np.float32)
+        np.add.at(statement_vectors, codes, np.asarray(sentence_vectors))
+        self.statement_vectors = normalize_rows(statement_vectors)
+
+        self.sentence_index = VectorIndex(sentence_vectors)
+        self.statement_index = VectorIndex(self.statement_vectors)
+
+    @classmethod
+    def load(cls, sentence_table, path):
+        """以 memory-map 方式加载句向量；文件缺失或与句子表不一致时返回 None。"""
+        if sentence_table is None or not os.path.exists(path):
+            return None
+        keys_path = keys_path_for(path)
+        vectors = np.load(path, mmap_mode='r')
+        if not os.path.exists(keys_path) or not np.array_equal(np.load(keys_path), sentence_row_keys(sentence_table)):
+            print(f"警告：句向量文件 '{path}' 与当前句子表不一致，请重新运行 scrape_fomc.py。")
+            return None
+        return cls(sentence_table, vectors)
+
+    def similar_statements(self, query_vector, k=5, exclude_date=None):
+        """返回与查询向量最相似的 k 条声明。"""
+        extra = 1 if exclude_date is not None else 0
+        scores, indices = self.statement_index.search(query_vector, k + extra)
+        results = [
+            {"date": self.dates[i], "similarity": float(s)}
+            for s, i in zip(scores[0], indices[0])
+            if i >= 0 and self.dates[i] != exclude_date
+        ]
+        return results[:k]
+
+    def statement_vector(self, date):
+        return self.statement_vectors[self.dates.index(date)]
+
+    def sentence_rows(self, date):
+        """某次会议声明在句子表中的行号。"""
+        return np.flatnonzero(self.sentence_codes == self.dates.index(date))
+
+    def previous_date(self, date):
+        position = self.dates.index(date)
+        return self.dates[position - 1] if position > 0 else None
+
+    def align_sentences(self, date, previous_date=None, threshold=0.85):
+        """
+        将本次会议的每个句子与上一次会议中最相似的句子对齐。
+
+        返回:
+        dict: 每个当前句子的最佳匹配及相似度；低于阈值的视为新增，
+              上一次会议中未被任何句子匹配到的视为删除。
+        """
+        previous_date = previous_date or self.previous_date(date)
+        current_rows = self.sentence_rows(date)
+        if previous_date is None:
+            previous_rows = np.array([], dtype=np.int64)
+        else:
+            previous_rows = self.sentence_rows(previous_date)
+
+        sentences = self.sentence_table['sentence'].astype(str).to_numpy()
+        aligned = []
+        matched_previous = np.zeros(len(previous_rows), dtype=bool)
+        if len(previous_rows):
+            index = VectorIndex(np.asarray(self.sentence_vectors[previous_rows]), use_approx=False)
+            scores, indices = index.search(np.asarray(self.sentence_vectors[current_rows]), k=1)
+            best_scores, best_indices = scores[:, 0], indices[:, 0]
+            matched_previous[best_indices[best_scores >= threshold]] = True
+        else:
+            best_scores = np.zeros(len(current_rows), dtype=np.float32)
+            best_indices = np.full(len(current_rows), -1)
+
+        for row, score, match in zip(current_rows, best_scores, best_indices):
+            aligned.append({
+                "sentence": sentences[row].strip(),
+                "matched_sentence": sentences[previous_rows[match]].strip() if match >= 0 else None,
+                "similarity": float(score),
+                "status": "unchanged" if score >= threshold else "new",
+            })
+
+        removed = [sentences[row].strip() for row in previous_rows[~matched_previous]]
+        return {
+            "date": date,
+            "previous_date": previous_date,
+            "threshold": threshold,
+            "sentences": aligned,
+            "removed_sentences": removed,
+        }
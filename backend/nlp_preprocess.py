@@ -0,0 +1,129 @@
+# backend/nlp_preprocess.py
+
+"""
+FinBERT 输入预处理：基于 tokenizer 的长句切窗 + 按长度分桶的批处理。
+
+- 超过模型长度上限的句子被切成互相重叠的 token 窗口，窗口得分按 token 数加权合并回句子。
+- 所有窗口按长度排序后再切批，使同一批内的长度接近，padding 最少。
+"""
+
+import time
+
+import numpy as np
+import torch
+
+# --配置--
+MAX_MODEL_TOKENS = 512  # FinBERT (BERT-base) 的最大输入长度，含 [CLS]/[SEP]
+WINDOW_STRIDE = 64      # 相邻窗口之间重叠的 token 数
+BATCH_SIZE = 32
+
+
+def chunk_token_windows(token_ids, max_tokens, stride=WINDOW_STRIDE):
+    """
+    把一个句子的 token 序列切成长度不超过 max_tokens、相邻重叠 stride 个 token 的窗口。
+    """
+    if len(token_ids) <= max_tokens:
+        return [token_ids]
+
+    step = max(max_tokens - stride, 1)
+    windows = []
+    for start in range(0, len(token_ids), step):
+        windows.append(token_ids[start:start + max_tokens])
+        if start + max_tokens >= len(token_ids):
+            break
+    return windows
+
+
+def encode_windows(tokenizer, sentences, max_tokens=MAX_MODEL_TOKENS, stride=WINDOW_STRIDE):
+    """
+    对所有句子一次性分词并切窗。
+
+    返回:
+    windows (list[list[int]]): 已加上特殊 token 的输入 id 序列
+    owners (np.ndarray): 每个窗口所属句子的下标
+    """
+    body_tokens = max_tokens - tokenizer.num_special_tokens_to_add()
+    encoded = tokenizer(list(sentences), add_special_tokens=False)["input_ids"]
+
+    windows, owners = [], []
+    for idx, token_ids in enumerate(encoded):
+        for window in chunk_token_windows(token_ids, body_tokens, stride):
+            windows.append(tokenizer.build_inputs_with_special_tokens(window))
+            owners.append(idx)
+    return windows, np.asarray(owners, dtype=np.int64)
+
+
+def plan_batches(lengths, batch_size=BATCH_SIZE, bucketed=True):
+    """
+    将输入划分为批次。bucketed=True 时先按长度排序，相邻长度的输入落入同一批。
+    """
+    lengths = np.asarray(lengths)
+    order = np.argsort(lengths, kind="stable") if bucketed else np.arange(len(lengths))
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def padding_stats(lengths, batches):
+    """计算一组批次的真实 token 数、补齐后 token 数以及 padding 占比。"""
+    lengths = np.asarray(lengths)
+    real_tokens = int(lengths.sum())
+    padded_tokens = int(sum(lengths[batch].max() * len(batch) for batch in batches))
+    padding_ratio = 1 - real_tokens / padded_tokens if padded_tokens else 0.0
+    return {
+        "real_tokens": real_tokens,
+        "padded_tokens": padded_tokens,
+        "padding_ratio": padding_ratio,
+    }
+
+
+def score_sentences(analyzer, sentences, batch_size=BATCH_SIZE, bucketed=True, stats=None):
+    """
+    用 sentiment-analysis pipeline 背后的模型对句子打分，不做任何截断。
+
+    参数:
+    analyzer: transformers 的 sentiment-analysis pipeline
+    sentences (list[str]): 待分析的句子
+    batch_size (int): 每批的窗口数
+    bucketed (bool): 是否按长度分桶
+    stats (dict): 可选，传入时写入 token 数、padding 占比和吞吐量
+
+    返回:
+    list[dict]: 与 pipeline 输出格式一致的 {"label", "score"}，另附全部标签概率 "probs"
+    """
+    if not sentences:
+        return []
+
+    tokenizer, model = analyzer.tokenizer, analyzer.model
+    windows, owners = encode_windows(tokenizer, sentences)
+    lengths = np.array([len(w) for w in windows])
+    batches = plan_batches(lengths, batch_size, bucketed)
+
+    labels = [model.config.id2label[i].lower() for i in range(model.config.num_labels)]
+    window_probs = np.zeros((len(windows), len(labels)), dtype=np.float32)
+
+    start_time = time.perf_counter()
+    with torch.no_grad():
+        for batch in batches:
+            inputs = tokenizer.pad({"input_ids": [windows[i] for i in batch]}, return_tensors="pt")
+            inputs = {k: v.to(model.device) for k, v in inputs.items()}
+            logits = model(**inputs).logits
+            window_probs[batch] = torch.softmax(logits, dim=-1).cpu().numpy()
+    elapsed = time.perf_counter() - start_time
+
+    # 同一句子的多个窗口按 token 数加权平均，得到句子级的标签概率
+    weights = lengths.astype(np.float32)
+    sentence_probs = np.zeros((len(sentences), len(labels)), dtype=np.float32)
+    np.add.at(sentence_probs, owners, window_probs * weights[:, None])
+    sentence_probs /= np.bincount(owners, weights=weights, minlength=len(sentences))[:, None]
+
+    if stats is not None:
+        stats.update(padding_stats(lengths, batches))
+        stats["num_sentences"] = len(sentences)
+        stats["num_windows"] = len(windows)
+        stats["seconds"] = elapsed
+        stats["tokens_per_second"] = stats["real_tokens"] / elapsed if elapsed > 0 else float("inf")
+
+    best = sentence_probs.argmax(axis=1)
+    return [
+        {"label": labels[b], "score": float(probs[b]), "probs": dict(zip(labels, probs.tolist()))}
+        for b, probs in zip(best, sentence_probs)
+    ]
@@ -0,0 +1,139 @@
+# backend/nlp_scoring.py
+
+"""
+句子级情感表与维度得分聚合。
+
+FinBERT 只需对每条声明的每个句子运行一次，结果（全部标签的概率）保存在句子表中。
+政策维度得分是在句子表上的向量化聚合，修改或新增 POLICY_DIMENSIONS 时无需重新运行模型。
+"""
+
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from backend.nlp_preprocess import score_sentences
+
+SENTIMENT_LABELS = ["positive", "negative", "neutral"]
+SENTENCE_TABLE_COLUMNS = ["date", "sentence_idx", "sentence"] + SENTIMENT_LABELS
+
+
+def normalize_date(date):
+    """统一日期格式为 'YYYY-MM-DD' 字符串，便于在 CSV 和内存之间对齐。"""
+    return pd.to_datetime(date).strftime('%Y-%m-%d')
+
+
+def split_statement(statement_text):
+    """按句号切分声明（与原有逻辑一致），去掉空白句子。"""
+    return [s for s in str(statement_text).lower().split('.') if s.strip()]
+
+
+def build_sentence_table(df, sentiment_analyzer, existing_table=None):
+    """
+    为每条声明的每个句子计算标签概率，返回句子表。
+
+    参数:
+    df (pd.DataFrame): 包含 'date' 和 'statement_text' 列的声明数据
+    sentiment_analyzer: transformers 的 sentiment-analysis pipeline
+    existing_table (pd.DataFrame): 可选，已有的句子表；其中已包含的日期不会重复计算
+
+    返回:
+    pd.DataFrame: 列为 SENTENCE_TABLE_COLUMNS 的句子表
+    """
+    if existing_table is None:
+        existing_table = pd.DataFrame(columns=SENTENCE_TABLE_COLUMNS)
+    done_dates = set(existing_table['date'].astype(str))
+
+    rows = []
+    for date, statement_text in zip(df['date'], df['statement_text']):
+        date = normalize_date(date)
+        if date in done_dates:
+            continue
+        for idx, sentence in enumerate(split_statement(statement_text)):
+            rows.append((date, idx, sentence))
+
+    if not rows:
+        print("  - 句子表已是最新，无需运行模型。")
+        return existing_table
+
+    new_table = pd.DataFrame(rows, columns=["date", "sentence_idx", "sentence"])
+    # 同一句子在不同声明中反复出现，只需打分一次
+    unique_sentences = new_table['sentence'].drop_duplicates().tolist()
+    print(f"  - 新增 {new_table['date'].nunique()} 条声明，{len(new_table)} 个句子"
+          f"（{len(unique_sentences)} 个不重复）。")
+
+    stats = {}
+    sentiments = score_sentences(sentiment_analyzer, unique_sentences, stats=stats)
+    print(f"  - 模型推理完成：{stats.get('tokens_per_second', 0):.0f} tokens/s，"
+          f"padding 占比 {stats.get('padding_ratio', 0):.1%}")
+
+    probs = pd.DataFrame(
+        [[s['probs'].get(label, 0.0) for label in SENTIMENT_LABELS] for s in sentiments],
+        columns=SENTIMENT_LABELS,
+    )
+    probs['sentence'] = unique_sentences
+    new_table = new_table.merge(probs, on='sentence', how='left')
+
+    return pd.concat([existing_table, new_table], ignore_index=True)[SENTENCE_TABLE_COLUMNS]
+
+
+def load_sentence_table(path):
+    """读取句子表；文件不存在时返回 None。"""
+    if not os.path.exists(path):
+        return None
+    table = pd.read_csv(path, keep_default_na=False)
+    table['date'] = table['date'].astype(str)
+    table[SENTIMENT_LABELS] = table[SENTIMENT_LABELS].astype(np.float64)
+    return table
+
+
+def validate_policy_dimensions(policy_dimensions):
+    """检查 POLICY_DIMENSIONS 的结构，不合法时抛出 ValueError。"""
+    if not isinstance(policy_dimensions, dict):
+        raise ValueError("POLICY_DIMENSIONS 必须是字典。")
+    for dim_key, dim_info in policy_dimensions.items():
+        if not isinstance(dim_info, dict):
+            raise ValueError(f"维度 '{dim_key}' 的定义必须是字典。")
+        for field in ("positive_name", "negative_name"):
+            if not isinstance(dim_info.get(field), str):
+                raise ValueError(f"维度 '{dim_key}' 缺少 '{field}'。")
+        keywords = dim_info.get("keywords")
+        if not isinstance(keywords, list) or not all(isinstance(k, str) for k in keywords):
+            raise ValueError(f"维度 '{dim_key}' 的 'keywords' 必须是字符串列表。")
+
+
+def score_dimensions(sentence_table, policy_dimensions):
+    """
+    在句子表上向量化地计算每条声明各维度的正面倾向得分 (0-100)。
+
+    与逐句调用 pipeline 的做法保持一致：每个相关句子只计入其最高概率标签的得分，
+    正面得分占 (正面 + 负面) 的百分比即为维度得分，无相关句子时为 50。
+    """
+    dates = pd.Index(sentence_table['date'].unique(), name='date')
+    if sentence_table.empty:
+        return pd.DataFrame({'date': dates})
+
+    probs = sentence_table[SENTIMENT_LABELS].to_numpy()
+    top_label = probs.argmax(axis=1)
+    top_score = probs[np.arange(len(probs)), top_label]
+    positive = np.where(top_label == SENTIMENT_LABELS.index('positive'), top_score, 0.0)
+    negative = np.where(top_label == SENTIMENT_LABELS.index('negative'), top_score, 0.0)
+
+    sentences = sentence_table['sentence'].astype(str)
+    result = pd.DataFrame(index=dates)
+    for dim_key, dim_info in policy_dimensions.items():
+        pattern = '|'.join(re.escape(keyword) for keyword in dim_info["keywords"])
+        relevant = sentences.str.contains(pattern, regex=True).to_numpy() if pattern else np.zeros(len(sentences), bool)
+
+        sums = pd.DataFrame({
+            'date': sentence_table['date'].to_numpy(),
+            'positive': np.where(relevant, positive, 0.0),
+            'negative': np.where(relevant, negative, 0.0),
+        }).groupby('date', sort=False).sum().reindex(dates)
+
+        total = sums['positive'] + sums['negative']
+        score = np.where(total > 0, sums['positive'] / total.where(total > 0, 1) * 100, 50)
+        result[f"{dim_key}_positive_score"] = np.round(score).astype(int)
+
+    return result.reset_index()
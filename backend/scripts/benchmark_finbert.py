@@ -0,0 +1,55 @@
+# backend/scripts/benchmark_finbert.py
+
+"""
+在 FOMC 语料上对比 FinBERT 推理的两种批处理方式：
+- 按原始顺序切批（之前的做法）
+- 按 token 长度分桶切批
+
+输出每种方式的吞吐量 (tokens/s) 和 padding 占比。
+"""
+
+import os
+import sys
+
+import pandas as pd
+from transformers import pipeline
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from backend.nlp_preprocess import score_sentences, BATCH_SIZE
+from backend.scripts.scrape_fomc import RAW_DATA_FILE, collect_relevant_sentences, normalize_raw_columns
+
+
+def main():
+    # 只读已有的原始数据，基准测试不触发抓取，也不改写任何数据文件
+    if not os.path.exists(RAW_DATA_FILE):
+        raise FileNotFoundError(f"原始数据文件 '{RAW_DATA_FILE}' 不存在，请先运行 scrape_fomc.py。")
+    raw_df = normalize_raw_columns(pd.read_csv(RAW_DATA_FILE))
+    sentences = []
+    for text in raw_df['statement_text'].astype(str).str.lower():
+        for dim_sentences in collect_relevant_sentences(text).values():
+            sentences.extend(dim_sentences)
+    print(f"基准语料：{len(raw_df)} 条声明，{len(sentences)} 个相关句子，batch_size={BATCH_SIZE}")
+
+    sentiment_analyzer = pipeline("sentiment-analysis", model="ProsusAI/finbert")
+    # 预热一次，避免首批的初始化开销影响计时
+    score_sentences(sentiment_analyzer, sentences[:BATCH_SIZE])
+
+    results = {}
+    for name, bucketed in [("原始顺序", False), ("长度分桶", True)]:
+        stats = {}
+        score_sentences(sentiment_analyzer, sentences, bucketed=bucketed, stats=stats)
+        results[name] = stats
+        print(f"\n[{name}]")
+        print(f"  窗口数:        {stats['num_windows']}")
+        print(f"  真实 tokens:   {stats['real_tokens']}")
+        print(f"  补齐后 tokens: {stats['padded_tokens']}")
+        print(f"  padding 占比:  {stats['padding_ratio']:.1%}")
+        print(f"  耗时:          {stats['seconds']:.2f} s")
+        print(f"  吞吐量:        {stats['tokens_per_second']:.0f} tokens/s")
+
+    speedup = results["长度分桶"]["tokens_per_second"] / results["原始顺序"]["tokens_per_second"]
+    print(f"\n分桶后吞吐量提升: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
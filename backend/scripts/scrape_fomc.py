@@ -1,6 +1,5 @@
 # backend/scripts/scrape_fomc.py
 
-from FedTools import MonetaryPolicyCommittee
 import os
 import pandas as pd
 from transformers import pipeline
@@ -8,34 +7,24 @@ from transformers import pipeline
 import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from backend.fomc_crawler import FomcStatementCrawler
 from backend.nlp_config import POLICY_DIMENSIONS
+from backend.nlp_embeddings import build_sentence_embeddings
+from backend.nlp_scoring import build_sentence_table, load_sentence_table, score_dimensions, normalize_date
 
 # --- 配置 ---
 RAW_DATA_FILE = os.path.join("../../data", "fomc_statements_raw.csv")
+CRAWL_MANIFEST_FILE = os.path.join("../../data", "fomc_crawl_manifest.jsonl")
 ANALYSIS_OUTPUT_FILE = os.path.join("../../data", "fomc_analysis.csv")
+SENTENCE_TABLE_FILE = os.path.join("../../data", "fomc_sentences.csv")
+EMBEDDINGS_FILE = os.path.join("../../data", "fomc_sentence_embeddings.npy")
 
 
-def fetch_and_save_raw_data():
+def normalize_raw_columns(df):
     """
-    使用 FedTools 获取原始声明数据并保存。
-    此版本确保返回的 DataFrame 列名是统一的。
+    统一原始数据的列名为 date / statement_text。
+    兼容旧版 FedTools 生成的文件（'index' / 'FOMC_Statements' 等列名）。
     """
-    print("步骤 1/2: 使用 FedTools 获取所有FOMC会议声明...")
-
-    if os.path.exists(RAW_DATA_FILE):
-        print(f"原始数据文件 '{RAW_DATA_FILE}' 已存在，直接读取。")
-        df = pd.read_csv(RAW_DATA_FILE)
-    else:
-        fomc = MonetaryPolicyCommittee(start_year=2000)
-        df = fomc.find_statements()
-        df = df.reset_index()
-        os.makedirs(os.path.dirname(RAW_DATA_FILE), exist_ok=True)
-        # 保存前不重命名，保持原始列名
-        df.to_csv(RAW_DATA_FILE, index=False, encoding='utf-8-sig')
-        print(f"爬取完成！原始数据已保存到: {RAW_DATA_FILE}")
-
-    # --- 解决方案：统一在这里进行重命名 ---
-    # 无论数据是新爬取的还是从文件读取的，都在这里确保列名正确
     if 'index' in df.columns:
         df = df.rename(columns={'index': 'date'})
     if 'FOMC_Statements' in df.columns:
@@ -46,52 +35,74 @@ def fetch_and_save_raw_data():
     # 确保关键列存在
     if 'date' not in df.columns or 'statement_text' not in df.columns:
         raise ValueError("无法在原始数据中找到 'date' 或 'statement_text' 列。")
+    return df
+
+
+def fetch_and_save_raw_data():
+    """
+    增量抓取 FOMC 会议声明并保存。
+    已有原始数据中的会议不会重复抓取；抓取中断后重新运行，会从清单文件记录的断点继续。
+    """
+    print("步骤 1/2: 增量抓取FOMC会议声明...")
+
+    if os.path.exists(RAW_DATA_FILE):
+        existing_df = normalize_raw_columns(pd.read_csv(RAW_DATA_FILE))[['date', 'statement_text']]
+        existing_df['date'] = existing_df['date'].map(normalize_date)
+        print(f"原始数据文件 '{RAW_DATA_FILE}' 已存在，包含 {len(existing_df)} 条声明，仅抓取新增会议。")
+    else:
+        existing_df = pd.DataFrame(columns=['date', 'statement_text'])
+
+    crawler = FomcStatementCrawler(CRAWL_MANIFEST_FILE, start_year=2000)
+    crawler.crawl(known_dates=existing_df['date'])
+
+    # 清单中包含本次及以往（包括被中断的）运行抓取到的全部声明
+    crawled_df = crawler.statements_frame()[['date', 'statement_text']]
+    df = pd.concat([existing_df, crawled_df], ignore_index=True)
+    df = df.drop_duplicates(subset='date', keep='first').sort_values('date').reset_index(drop=True)
+
+    if len(df) > len(existing_df):
+        os.makedirs(os.path.dirname(RAW_DATA_FILE), exist_ok=True)
+        df.to_csv(RAW_DATA_FILE, index=False, encoding='utf-8-sig')
+        print(f"新增 {len(df) - len(existing_df)} 条声明，原始数据已保存到: {RAW_DATA_FILE}")
 
     print(f"总共获取了 {len(df)} 条声明。")
     return df
 
 
+def collect_relevant_sentences(statement_text):
+    """
+    按维度找出声明中的相关句子。
+
+    返回:
+    dict: {维度名: [相关句子, ...]}
+    """
+    return {
+        dim_key: [s for s in statement_text.split('.') if any(keyword in s for keyword in dim_info["keywords"])]
+        for dim_key, dim_info in POLICY_DIMENSIONS.items()
+    }
+
+
 def analyze_statements(df):
     """
     对包含声明文本的 DataFrame 进行多维度情感分析。
-    (此函数保持上次修改后的版本，无需改动)
+    FinBERT 只对句子表中尚未出现的声明运行；维度得分由句子表向量化聚合得到。
     """
     print("\n步骤 2/2: 正在加载NLP模型并进行多维度情感分析...")
 
-    sentiment_analyzer = pipeline("sentiment-analysis", model="ProsusAI/finbert")
-
-    analysis_records = []
-
     if 'statement_text' not in df.columns:
         raise ValueError("传入的 DataFrame 中缺少 'statement_text' 列。")
 
-    for row in df.itertuples(index=False, name=None):
-        row_dict = dict(zip(df.columns, row))
-        statement_text = str(row_dict.get('statement_text', '')).lower()
-        date = row_dict.get('date')
-
-        if not statement_text: continue
+    existing_table = load_sentence_table(SENTENCE_TABLE_FILE)
+    sentiment_analyzer = pipeline("sentiment-analysis", model="ProsusAI/finbert")
+    sentence_table = build_sentence_table(df, sentiment_analyzer, existing_table)
 
-        print(f"  - 正在分析 {date} 的声明...")
+    sentence_table.to_csv(SENTENCE_TABLE_FILE, index=False, encoding='utf-8-sig')
+    print(f"  - 句子级情感表已保存到: {SENTENCE_TABLE_FILE}")
 
-        record = {"date": date}
-        for dim_key, dim_info in POLICY_DIMENSIONS.items():
-            relevant_sentences = [s for s in statement_text.split('.') if
-                                  any(keyword in s for keyword in dim_info["keywords"])]
-            if not relevant_sentences:
-                score_positive = 50
-            else:
-                relevant_sentences = relevant_sentences[:20]
-                relevant_sentences = [s[:512] for s in relevant_sentences]
-                sentiments = sentiment_analyzer(relevant_sentences)
-                positive_score = sum(s['score'] for s in sentiments if s['label'] == 'positive')
-                negative_score = sum(s['score'] for s in sentiments if s['label'] == 'negative')
-                total_score = positive_score + negative_score
-                score_positive = (positive_score / total_score) * 100 if total_score > 0 else 50
-            record[f"{dim_key}_positive_score"] = round(score_positive)
-        analysis_records.append(record)
+    # 与句子表逐行对齐的句向量，用于相似声明检索和会议间变化对比
+    build_sentence_embeddings(sentence_table, EMBEDDINGS_FILE)
 
-    return pd.DataFrame(analysis_records)
+    return score_dimensions(sentence_table, POLICY_DIMENSIONS)
 
 
 def main():
@@ -106,6 +117,7 @@ def main():
 
     # --- 解决方案：这里的 raw_df 已经包含了正确的列名 ---
     # 现在这行代码可以正常工作了
+    raw_df['date'] = raw_df['date'].map(normalize_date)
     final_df = pd.merge(raw_df[['date', 'statement_text']], analysis_df, on='date')
 
     # 保存最终的分析结果
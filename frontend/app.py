@@ -1,7 +1,7 @@
 # frontend/app.py
 
 import streamlit as st
-from app_show_data_ui import show_home_page, show_data_explorer_page, test_backend_connection
+from app_show_data_ui import show_home_page, show_data_explorer_page, show_derived_series_explorer, show_granger_heatmap, test_backend_connection
 from nlp_ui import show_nlp_analysis_page
 from var_ui import show_var_simulation_page
 
@@ -20,6 +20,10 @@ if page == "首页":
 elif page == "数据浏览器":
     st.title("数据浏览器")
     show_data_explorer_page()
+    st.divider()
+    show_derived_series_explorer()
+    st.divider()
+    show_granger_heatmap()
 elif page == "政策声明分析(NLP)":
     st.title("政策声明情感分析 (NLP)")
     show_nlp_analysis_page()
@@ -103,6 +103,95 @@ def show_data_explorer_page():
             st.error(f"处理数据时发生错误: {e}")
 
 
+def show_derived_series_explorer():
+    """
+    浏览由原始指标派生出的模型输入序列（通胀率、同比、移动平均、利差、实际利率等）。
+    """
+    st.subheader("派生序列")
+    try:
+        response = requests.get("http://localhost:8000/data/derived/catalog")
+        response.raise_for_status()
+        catalog = {item['series_id']: item for item in response.json()['data']}
+
+        selected = st.multiselect(
+            "选择派生序列",
+            options=list(catalog.keys()),
+            default=list(catalog.keys())[:2],
+            format_func=lambda key: catalog[key]['name']
+        )
+        if not selected:
+            return
+
+        response = requests.get("http://localhost:8000/data/derived", params={"names": ",".join(selected)})
+        response.raise_for_status()
+        df = pd.DataFrame(response.json()['data'])
+        df['DATE'] = pd.to_datetime(df['DATE'])
+
+        df_melted = df.melt(id_vars=['DATE'], value_vars=selected, var_name='series_key', value_name='value')
+        df_melted['指标名称'] = df_melted['series_key'].map(lambda k: catalog[k]['name'])
+        fig = px.line(df_melted, x='DATE', y='value', color='指标名称', title="派生序列 (月度)")
+        fig.update_xaxes(title_text="日期")
+        fig.update_yaxes(title_text="数值")
+        st.plotly_chart(fig, use_container_width=True)
+
+        with st.expander("查看派生序列的定义"):
+            st.dataframe(pd.DataFrame([catalog[k] for k in selected]))
+
+    except requests.exceptions.RequestException as e:
+        st.error(f"无法连接后端。错误: {e}")
+
+
+def show_granger_heatmap():
+    """
+    以热力图展示各指标两两之间的 Granger 因果检验 p 值（行: 原因，列: 结果）。
+    """
+    st.subheader("领先-滞后关系 (Granger 因果检验)")
+    series_names = {
+        "gdp": "GDP", "cpiaucsl": "CPI", "fedfunds": "联邦基金利率",
+        "unrate": "失业率", "dgs10": "10年期国债收益率"
+    }
+
+    col1, col2 = st.columns(2)
+    with col1:
+        maxlag = st.slider("最大滞后阶数 (月)", min_value=1, max_value=12, value=6)
+    with col2:
+        transform = st.selectbox(
+            "平稳化变换",
+            options=["diff", "pct", "level"],
+            format_func=lambda key: {"diff": "一阶差分", "pct": "环比变化率 (%)", "level": "原始水平值"}[key]
+        )
+
+    try:
+        response = requests.post(
+            "http://localhost:8000/analysis/granger",
+            json={"series": list(series_names.keys()), "maxlag": maxlag, "transform": transform}
+        )
+        if response.status_code != 200:
+            st.error(f"计算失败: {response.json().get('detail', '未知错误')}")
+            return
+
+        result = response.json()
+        labels = [series_names.get(s, s) for s in result['series']]
+        df_p = pd.DataFrame(result['p_value'], index=labels, columns=labels)
+
+        fig = px.imshow(
+            df_p,
+            text_auto=".3f",
+            color_continuous_scale="RdBu",
+            range_color=[0, 0.2],
+            labels={"x": "结果 (被预测)", "y": "原因 (领先)", "color": "p 值"},
+            title=f"Granger 因果 p 值矩阵（按 {result['criterion'].upper()} 选择滞后阶数）"
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption("p 值越小，说明行变量对列变量的领先（预测）作用越显著。")
+
+        with st.expander("查看最优滞后阶数"):
+            st.dataframe(pd.DataFrame(result['best_lag'], index=labels, columns=labels))
+
+    except requests.exceptions.RequestException as e:
+        st.error(f"无法连接后端。错误: {e}")
+
+
 def test_backend_connection():
     """测试与后端API的连接。"""
     try:
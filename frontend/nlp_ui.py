@@ -5,6 +5,20 @@ import requests
 import pandas as pd
 import plotly.express as px
 
+# 已知维度的中文名称；其他维度（如在 nlp_config.py 中新增的）直接显示维度键
+KNOWN_DIMENSIONS = {
+    "monetary_stance_positive_score": "货币立场 (鹰派倾向)",
+    "economic_outlook_positive_score": "经济前景 (乐观倾向)"
+}
+
+
+def dimension_labels(columns):
+    """维度列表以后端返回的 '*_positive_score' 列为准，维度热加载后会自动更新。"""
+    return {
+        col: KNOWN_DIMENSIONS.get(col, col.replace("_positive_score", ""))
+        for col in columns if col.endswith("_positive_score")
+    }
+
 # ---------------------------------
 #  新的实时分析 UI 函数
 # ---------------------------------
@@ -64,10 +78,121 @@ def show_realtime_nlp_analyzer():
                     st.error(f"无法连接到后端服务: {e}")
 
 
+# ---------------------------------
+#  相似声明检索 & 会议间变化
+# ---------------------------------
+def show_statement_similarity(meeting_dates):
+    """
+    基于后端向量索引，查找与所选会议最相似的历史声明，并对比其与上次会议的句子变化。
+    """
+    st.subheader("相似声明与会议间变化")
+    selected_date = st.selectbox("选择会议日期:", options=meeting_dates[::-1], key="similarity_date")
+    if not selected_date:
+        return
+
+    col1, col2 = st.columns(2)
+    try:
+        with col1:
+            response = requests.post("http://localhost:8000/analysis/fomc/similar", json={"date": selected_date, "k": 5})
+            if response.status_code == 200:
+                df_similar = pd.DataFrame(response.json()['data'])
+                st.markdown("**最相似的历史声明**")
+                st.dataframe(df_similar, use_container_width=True)
+            else:
+                st.warning(f"相似检索不可用: {response.json().get('detail', '未知错误')}")
+
+        with col2:
+            response = requests.post("http://localhost:8000/analysis/fomc/changes", json={"date": selected_date})
+            if response.status_code == 200:
+                result = response.json()
+                st.markdown(f"**相对上次会议 ({result['previous_date']}) 的变化**")
+                for item in result['sentences']:
+                    if item['status'] == 'new':
+                        st.markdown(f"🟢 {item['sentence']}")
+                for sentence in result['removed_sentences']:
+                    st.markdown(f"🔴 ~~{sentence}~~")
+            else:
+                st.warning(f"变化对比不可用: {response.json().get('detail', '未知错误')}")
+    except requests.exceptions.RequestException as e:
+        st.error(f"无法连接到后端服务: {e}")
+
+
+# ---------------------------------
+#  事件研究：声明情感 vs. 市场反应
+# ---------------------------------
+def show_event_study():
+    """
+    展示每次 FOMC 会议前后市场序列的变化，以及这些变化与声明情感得分的相关性。
+    """
+    st.subheader("事件研究：声明情感与市场反应")
+    series_names = {"DGS2": "2年期国债收益率", "DGS10": "10年期国债收益率", "T10Y2Y": "10年-2年期限利差", "DFF": "有效联邦基金利率"}
+
+    col1, col2 = st.columns(2)
+    with col1:
+        pre_window = st.slider("会前窗口 (交易日)", min_value=1, max_value=20, value=5)
+    with col2:
+        post_window = st.slider("会后窗口 (交易日)", min_value=1, max_value=20, value=1)
+
+    try:
+        response = requests.post(
+            "http://localhost:8000/analysis/fomc/event_study",
+            json={"series": list(series_names.keys()), "pre_window": pre_window, "post_window": post_window}
+        )
+        if response.status_code != 200:
+            st.warning(f"事件研究不可用: {response.json().get('detail', '未知错误')}")
+            return
+
+        result = response.json()
+        df_corr = pd.DataFrame(result['correlation_post']).T.rename(columns=series_names)
+        fig = px.imshow(
+            df_corr,
+            text_auto=".2f",
+            color_continuous_scale="RdBu",
+            range_color=[-1, 1],
+            title=f"情感得分与会后 {post_window} 个交易日市场变化的相关系数"
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+        df_events = pd.DataFrame(result['events'])
+        dimension_options = dimension_labels(df_events.columns)
+        if not dimension_options:
+            st.info("当前没有可用的情感维度得分。")
+            return
+
+        col1, col2 = st.columns(2)
+        with col1:
+            selected_dimension = st.selectbox(
+                "选择情感维度:",
+                options=list(dimension_options.keys()),
+                format_func=lambda key: dimension_options[key],
+                key="event_study_dimension"
+            )
+        with col2:
+            selected_series = st.selectbox("选择市场序列:", options=list(series_names.keys()), format_func=series_names.get)
+        fig = px.scatter(
+            df_events,
+            x=selected_dimension,
+            y=f"{selected_series}_post",
+            hover_data=["date"],
+            labels={
+                selected_dimension: dimension_options[selected_dimension],
+                f"{selected_series}_post": f"{series_names[selected_series]} 会后变化 (百分点)"
+            },
+            title=f"逐次会议：{dimension_options[selected_dimension]} vs. 会后市场变化"
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+        with st.expander("查看逐次会议的窗口变化"):
+            st.dataframe(df_events)
+
+    except requests.exceptions.RequestException as e:
+        st.error(f"无法连接到后端服务: {e}")
+
+
 # ---------------------------------
 #  历史数据仪表盘函数 (保持不变)
 # ---------------------------------
-@st.cache_data
+@st.cache_data(ttl=5)  # 短暂缓存：后端热加载维度定义后，几秒内即可反映到页面
 def load_fomc_history():
     """从后端API获取完整的FOMC分析历史数据。"""
     api_url = "http://localhost:8000/analysis/fomc/history"
@@ -92,10 +217,7 @@ def show_nlp_analysis_page():
         with st.spinner("正在从后端加载分析历史..."):
             df_analysis = load_fomc_history()
 
-        dimension_options = {
-            "monetary_stance_positive_score": "货币立场 (鹰派倾向)",
-            "economic_outlook_positive_score": "经济前景 (乐观倾向)"
-        }
+        dimension_options = dimension_labels(df_analysis.columns)
         selected_dimension = st.selectbox(
             "选择要可视化的分析维度:",
             options=list(dimension_options.keys()),
@@ -128,6 +250,13 @@ def show_nlp_analysis_page():
 
     except Exception as e:
         st.error(f"加载历史数据时出错: {e}")
+        df_analysis = None
+
+    if df_analysis is not None and not df_analysis.empty:
+        st.divider()
+        show_statement_similarity(df_analysis.index.strftime('%Y-%m-%d').tolist())
+        st.divider()
+        show_event_study()
 
     # --- 分割线 ---
     st.divider()
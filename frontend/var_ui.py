@@ -4,19 +4,41 @@ import streamlit as st
 import requests
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 
 
 def show_var_simulation_page():
-    st.markdown("此模块基于VAR模型，模拟一项政策冲击（如加息）对其他经济变量的动态影响。")
+    st.markdown("此模块基于VAR模型或局部投影 (Local Projection)，模拟一项政策冲击（如加息）对其他经济变量的动态影响。")
     st.info("注意：当前模型仅包含利率和通胀，结果可能存在'价格之谜'现象，仅供演示。")
 
-    var_options = {
+    var_names = {
         "FEDFUNDS": "联邦基金利率",
-        "INFLATION": "通胀率"
+        "INFLATION": "通胀率",
+        "UNRATE": "失业率"
     }
+    # 可选模型及其变量来自后端的 VAR_MODELS 注册表
+    try:
+        response = requests.get("http://localhost:8000/simulate/var_models")
+        response.raise_for_status()
+        model_options = {item['model']: item for item in response.json()['data']}
+        # 派生序列沿用派生序列目录中的名称
+        response = requests.get("http://localhost:8000/data/derived/catalog")
+        response.raise_for_status()
+        for item in response.json()['data']:
+            var_names.setdefault(item['series_id'], item['name'])
+    except requests.exceptions.RequestException as e:
+        st.error(f"无法获取模型列表: {e}")
+        return
 
     st.subheader("模拟参数设置")
 
+    model_name = st.selectbox(
+        "选择模型:",
+        options=list(model_options.keys()),
+        format_func=lambda key: model_options[key]['name']
+    )
+    var_options = {key: var_names.get(key, key) for key in model_options[model_name]['variables']}
+
     col1, col2 = st.columns(2)
 
     with col1:
@@ -43,47 +65,84 @@ def show_var_simulation_page():
         step=0.05  # 每次调整的步长
     )
 
+    method_options = {
+        "var": "VAR",
+        "lp": "局部投影 (LP)",
+        "both": "VAR 与 LP 对比"
+    }
+    method = st.radio(
+        "估计方法:",
+        options=list(method_options.keys()),
+        format_func=lambda key: method_options[key],
+        horizontal=True
+    )
+    if method != "var":
+        st.caption("局部投影按变量顺序递归识别，每一期单独回归，阴影为 95% HAC 置信区间。")
+
     steps = 12
 
     if st.button(f"模拟 {var_options[impulse_var]} ({shock_size:+.2f}%) 冲击对 {var_options[response_var]} 的影响"):
         with st.spinner("正在训练模型并进行模拟..."):
             try:
                 api_url = "http://localhost:8000/simulate/var_irf"
-
-                # --- 将 shock_size 添加到发送给后端的 payload 中 ---
-                payload = {
-                    "impulse": impulse_var,
-                    "response": response_var,
-                    "steps": steps,
-                    "shock_size": shock_size  # 新增参数
-                }
-                response = requests.post(api_url, json=payload)
-
-                if response.status_code == 200:
-                    st.success("模拟成功！")
-                    result = response.json()
-                    df_irf = pd.DataFrame(result['data'])
-
-                    impulse_name = var_options.get(result['impulse'], result['impulse'])
-                    response_name = var_options.get(result['response'], result['response'])
-
-                    chart_title = f"脉冲响应: {impulse_name} ({result['shock_size']:+.2f}%) 的一次冲击对 {response_name} 的影响"
-
-                    fig = px.line(
-                        df_irf,
-                        x='step',
-                        y='value',
-                        title=chart_title,
-                        labels={
-                            "step": "冲击后的月份",
-                            "value": f"{response_name} 的响应值 (百分点变化)"
-                        }
-                    )
-                    fig.add_hline(y=0, line_dash="dash", line_color="grey")
-                    st.plotly_chart(fig, use_container_width=True)
-                    st.dataframe(df_irf)
-                else:
-                    st.error(f"模拟失败: {response.json().get('detail', '未知错误')}")
+                methods = ["var", "lp"] if method == "both" else [method]
+
+                results = []
+                for m in methods:
+                    # --- 将 shock_size 添加到发送给后端的 payload 中 ---
+                    payload = {
+                        "model": model_name,
+                        "method": m,
+                        "impulse": impulse_var,
+                        "response": response_var,
+                        "steps": steps,
+                        "shock_size": shock_size  # 新增参数
+                    }
+                    response = requests.post(api_url, json=payload)
+                    if response.status_code != 200:
+                        st.error(f"模拟失败: {response.json().get('detail', '未知错误')}")
+                        return
+                    results.append(response.json())
+
+                st.success("模拟成功！")
+                result = results[0]
+                df_irf = pd.concat(
+                    [pd.DataFrame(r['data']).assign(方法=method_options[r['method']]) for r in results],
+                    ignore_index=True
+                )
+
+                impulse_name = var_options.get(result['impulse'], result['impulse'])
+                response_name = var_options.get(result['response'], result['response'])
+
+                chart_title = f"脉冲响应: {impulse_name} ({result['shock_size']:+.2f}%) 的一次冲击对 {response_name} 的影响"
+
+                fig = px.line(
+                    df_irf,
+                    x='step',
+                    y='value',
+                    color='方法',
+                    title=chart_title,
+                    labels={
+                        "step": "冲击后的月份",
+                        "value": f"{response_name} 的响应值 (百分点变化)"
+                    }
+                )
+                # 局部投影的置信区间
+                if 'lower' in df_irf.columns:
+                    df_lp = df_irf.dropna(subset=['lower'])
+                    fig.add_trace(go.Scatter(
+                        x=list(df_lp['step']) + list(df_lp['step'][::-1]),
+                        y=list(df_lp['upper']) + list(df_lp['lower'][::-1]),
+                        fill='toself',
+                        fillcolor='rgba(0, 176, 146, 0.2)',
+                        line=dict(width=0),
+                        name="LP 95% 置信区间",
+                        hoverinfo='skip'
+                    ))
+                fig.add_hline(y=0, line_dash="dash", line_color="grey")
+                st.plotly_chart(fig, use_container_width=True)
+                st.caption(f"冲击识别: {result['identification']}")
+                st.dataframe(df_irf)
 
             except requests.exceptions.RequestException as e:
-                st.error(f"无法连接到后端服务: {e}")
\ No newline at end of file
+                st.error(f"无法连接到后端服务: {e}")
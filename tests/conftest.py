@@ -0,0 +1,7 @@
+# tests/conftest.py
+
+import os
+import sys
+
+# 让测试可以像应用一样以 backend.xxx 的形式导入模块
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
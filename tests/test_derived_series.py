@@ -0,0 +1,65 @@
+# tests/test_derived_series.py
+
+"""
+派生序列层：派生值不随同时请求的其他序列变化，源数据不变时命中缓存。
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend import derived_series
+from backend.derived_series import DerivedSeriesStore
+
+
+def synthetic_fred():
+    """CPI 类月度序列比日度的国债收益率早结束几个月，与真实发布节奏类似。"""
+    rng = np.random.default_rng(0)
+    monthly_index = pd.date_range("2020-01-01", "2023-06-01", freq="MS")
+    daily_index = pd.bdate_range("2020-01-02", "2023-09-15")
+    cpi = pd.Series(250 * np.exp(np.cumsum(rng.normal(0.002, 0.001, len(monthly_index)))), index=monthly_index)
+    return {
+        "CPILFESL": cpi,
+        "CPIAUCSL": cpi * 1.05,
+        "FEDFUNDS": pd.Series(rng.uniform(0, 5, len(monthly_index)), index=monthly_index),
+        "DGS10": pd.Series(rng.uniform(1, 4, len(daily_index)), index=daily_index),
+    }
+
+
+@pytest.fixture
+def store():
+    data = synthetic_fred()
+    # 与 fetch_fred_data 一样，把请求的序列外连接成一个 DataFrame
+    return DerivedSeriesStore(lambda ids: pd.concat({sid: data[sid] for sid in ids}, axis=1, sort=True))
+
+
+@pytest.fixture
+def transform_calls(monkeypatch):
+    calls = []
+    for name, transform in list(derived_series.TRANSFORMS.items()):
+        def counted(*args, _name=name, _transform=transform, **kwargs):
+            calls.append(_name)
+            return _transform(*args, **kwargs)
+        monkeypatch.setitem(derived_series.TRANSFORMS, name, counted)
+    return calls
+
+
+def test_derived_value_does_not_depend_on_co_requested_series(store, transform_calls):
+    alone = store.get(["INFLATION"])["INFLATION"]
+    assert transform_calls == ["log_diff"]
+
+    together = store.get(["INFLATION", "DGS10"])
+    # 第二次请求的源数据没有变化，应直接命中缓存
+    assert transform_calls == ["log_diff"]
+    pd.testing.assert_series_equal(together["INFLATION"].dropna(), alone.dropna())
+
+    # CPI 最后一个月之后没有编造出来的 0 通胀
+    assert together["INFLATION"].last_valid_index() == pd.Timestamp("2023-06-01")
+    assert together.loc["2023-07-01":, "INFLATION"].isna().all()
+    assert together.loc["2023-07-01":, "DGS10"].notna().all()
+
+
+def test_nested_derived_series_ignore_stale_sources(store):
+    real_rate = store.get(["REAL_FEDFUNDS", "DGS10"])["REAL_FEDFUNDS"]
+    assert real_rate.last_valid_index() == pd.Timestamp("2023-06-01")
+    pd.testing.assert_series_equal(real_rate.dropna(), store.get(["REAL_FEDFUNDS"])["REAL_FEDFUNDS"].dropna())
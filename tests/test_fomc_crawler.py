@@ -0,0 +1,94 @@
+# tests/test_fomc_crawler.py
+
+"""
+对着一个模拟 federalreserve.gov 目录结构的本地 HTTP 服务器测试 FOMC 声明爬虫。
+"""
+
+import functools
+import json
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.fomc_crawler import FomcStatementCrawler
+
+FIXTURE_SITE = os.path.join(os.path.dirname(__file__), "fixtures", "federalreserve")
+
+
+class RecordingHandler(SimpleHTTPRequestHandler):
+    """记录所有请求路径的静态文件服务器。"""
+
+    def do_GET(self):
+        self.server.requested_paths.append(self.path)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fed_site():
+    handler = functools.partial(RecordingHandler, directory=FIXTURE_SITE)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.requested_paths = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_crawler(server, manifest_path):
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    return FomcStatementCrawler(manifest_path, base_url=base_url, start_year=2000,
+                                min_interval=0, max_retries=0)
+
+
+def test_crawl_parses_listings_and_skips_missing_pages(fed_site, tmp_path):
+    crawler = make_crawler(fed_site, str(tmp_path / "manifest.jsonl"))
+    records = crawler.crawl()
+
+    # 2000 年的声明位于 boarddocs/press/general，同目录下的其他新闻稿被忽略；
+    # 2023-07-26 的声明页面不存在 (404)，被跳过
+    assert sorted(r["date"] for r in records) == ["2000-02-02", "2003-06-25", "2023-05-03", "2023-06-14"]
+
+    df = crawler.statements_frame()
+    text_by_date = dict(zip(df["date"], df["statement_text"]))
+    assert text_by_date["2000-02-02"].startswith("The Federal Open Market Committee voted today")
+    assert text_by_date["2023-05-03"].startswith("Inflation remains elevated.")
+    assert "Menu" not in text_by_date["2023-05-03"]
+    assert not any("20000210" in path for path in fed_site.requested_paths)
+
+
+def test_crawl_resumes_from_manifest(fed_site, tmp_path):
+    manifest_path = tmp_path / "manifest.jsonl"
+    make_crawler(fed_site, str(manifest_path)).crawl()
+
+    # 模拟中途被中断：丢掉最后一篇声明，并留下写了一半的一行
+    lines = manifest_path.read_text(encoding="utf-8").splitlines()
+    statement_lines = [i for i, line in enumerate(lines) if json.loads(line)["kind"] == "statement"]
+    dropped = json.loads(lines.pop(statement_lines[-1]))
+    manifest_path.write_text("\n".join(lines) + "\n" + '{"url": "http://trunc', encoding="utf-8")
+
+    fed_site.requested_paths.clear()
+    records = make_crawler(fed_site, str(manifest_path)).crawl()
+
+    assert [r["url"] for r in records] == [dropped["url"]]
+    statement_requests = [p for p in fed_site.requested_paths if "fomchistorical" not in p and "fomccalendars" not in p]
+    # 只重新请求缺失的声明，以及仍然 404 的那一篇
+    assert sorted(statement_requests) == sorted([
+        dropped["url"].split(str(fed_site.server_address[1]))[1],
+        "/newsevents/pressreleases/monetary20230726a.htm",
+    ])
+    # 已成功抓取过的归档历史页面不会被重复请求
+    assert "/monetarypolicy/fomchistorical2000.htm" not in fed_site.requested_paths
+    assert "/monetarypolicy/fomchistorical2003.htm" not in fed_site.requested_paths
+
+
+def test_crawl_skips_known_dates(fed_site, tmp_path):
+    crawler = make_crawler(fed_site, str(tmp_path / "manifest.jsonl"))
+    records = crawler.crawl(known_dates=["2000-02-02", "2003-06-25", "2023-05-03"])
+
+    assert [r["date"] for r in records] == ["2023-06-14"]